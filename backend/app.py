@@ -1,68 +1,135 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Blueprint, current_app, request, jsonify, make_response, stream_with_context
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 from datetime import datetime
 import os
+import logging
+import time
+import threading
+import functools
+import orjson
 from dotenv import load_dotenv
 import re
-import dateparser
 from sqlite_db import get_sqlite_db_manager
 from memory_db import get_memory_db_manager
 from models import MessageCreate, MeetingCreate, MeetingIntent
 from email_service import get_email_service
 from demo_email_service import get_demo_email_service
 from sample_data import load_sample_data, clear_sample_data, get_sample_conversation_summary
-from simple_nlp import analyze_meeting_intent, suggest_meeting_times
+from simple_nlp import analyze_meeting_intent, analyze_meeting_intents, suggest_meeting_times
 from conversation_analyzer import get_conversation_analyzer
 
-# ✅ Load environment variables
-load_dotenv()
-
-# ✅ Initialize Flask
-app = Flask(__name__)
-CORS(app)
-
-# ✅ Initialize database manager
-try:
-    db_manager = get_sqlite_db_manager()
-    if not db_manager.test_connection():
-        raise Exception("Database connection failed")
-    print("✅ SQLite database manager initialized successfully")
-except Exception as e:
-    print(f"⚠️ SQLite connection failed: {e}")
-    print("🔄 Falling back to in-memory database for testing...")
+# ✅ Routes live on a blueprint; create_app() builds the Flask app around it
+api = Blueprint("api", __name__)
+
+def ojsonify(obj, status=200):
+    """jsonify replacement backed by orjson for large list payloads"""
+    # Keys are sorted to match Flask's jsonify; naive datetimes are local time
+    # and serialize as ISO 8601 without an offset
+    return current_app.response_class(
+        orjson.dumps(obj, option=orjson.OPT_SORT_KEYS),
+        status=status,
+        mimetype='application/json'
+    )
+
+def ojsonify_stream(rows):
+    """Stream an iterable of rows as a JSON array, one orjson-encoded row at a time"""
+    def generate():
+        yield b'['
+        for i, row in enumerate(rows):
+            if i:
+                yield b','
+            yield orjson.dumps(row, option=orjson.OPT_SORT_KEYS)
+        yield b']'
+    return current_app.response_class(stream_with_context(generate()), mimetype='application/json')
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, so jsonify and request.get_json share ojsonify's encoder"""
+    
+    # Sorted keys match Flask's default provider; non-string keys are stringified as json did
+    option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.option, default=str).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=self.option, default=str),
+            mimetype='application/json'
+        )
+
+# ✅ Database manager, initialized on first use
+_db_manager = None
+_db_manager_lock = threading.Lock()
+
+def db():
+    """Get the database manager, choosing it once for the whole process"""
+    global _db_manager
+    if _db_manager is None:
+        with _db_manager_lock:
+            if _db_manager is None:
+                _db_manager = _open_db()
+    return _db_manager
+
+def _open_db():
+    """Get the SQLite database manager, falling back to the in-memory one"""
     try:
-        db_manager = get_memory_db_manager()
-        print("✅ Memory database manager initialized successfully")
-    except Exception as mem_e:
-        print(f"❌ Memory database initialization failed: {mem_e}")
-        raise mem_e
-
-# ✅ Initialize email service
-try:
-    # Try real email service first
-    email_service = get_email_service()
-    if email_service.email_enabled:
-        print("✅ Real email service initialized successfully")
-    else:
+        db_manager = get_sqlite_db_manager()
+        if not db_manager.test_connection():
+            raise Exception("Database connection failed")
+        print("✅ SQLite database manager initialized successfully")
+    except Exception as e:
+        print(f"⚠️ SQLite connection failed: {e}")
+        print("🔄 Falling back to in-memory database for testing...")
+        try:
+            db_manager = get_memory_db_manager()
+            print("✅ Memory database manager initialized successfully")
+        except Exception as mem_e:
+            print(f"❌ Memory database initialization failed: {mem_e}")
+            raise mem_e
+    return db_manager
+
+# ✅ Email service, initialized on first use
+@functools.lru_cache(maxsize=1)
+def mailer():
+    """Get the real email service, falling back to the demo one"""
+    try:
+        # Try real email service first
+        email_service = get_email_service()
+        if email_service.email_enabled:
+            print("✅ Real email service initialized successfully")
+        else:
+            # Fall back to demo email service
+            email_service = get_demo_email_service()
+            print("✅ Demo email service initialized successfully")
+    except Exception as e:
+        print(f"⚠️ Email service initialization failed: {e}")
         # Fall back to demo email service
         email_service = get_demo_email_service()
         print("✅ Demo email service initialized successfully")
-except Exception as e:
-    print(f"⚠️ Email service initialization failed: {e}")
-    # Fall back to demo email service
-    email_service = get_demo_email_service()
-    print("✅ Demo email service initialized successfully")
+    return email_service
 
-# ✅ Load NLP
-print("✅ Simplified NLP module loaded successfully")
+def _report_email_result(future):
+    """Log a background confirmation send that failed, since no request waits for it"""
+    try:
+        sent = future.result()
+    except Exception as e:
+        print(f"❌ Background email confirmation failed: {e}")
+        return
+    if not sent:
+        print("❌ Background email confirmation was not delivered")
 
 # ---------------- ROUTES ---------------- #
 
-@app.route("/")
+@api.route("/")
 def home():
     """Health check endpoint"""
     try:
-        stats = db_manager.get_chat_statistics()
+        stats = db().get_chat_statistics()
         return jsonify({
             "message": "Backend running and connected to MongoDB Atlas!",
             "statistics": stats
@@ -70,24 +137,40 @@ def home():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@app.route("/health")
+# Liveness probes hit /health often, so its timestamp string and database
+# check are refreshed at most once per second
+_health_timestamp = (0, "")
+_health_db_status = (0.0, False)
+
+@api.route("/health")
 def health_check():
     """Detailed health check"""
+    global _health_timestamp, _health_db_status
     try:
-        db_status = db_manager.test_connection()
+        db_manager = db()
+        email_service = mailer()
+        
+        now = time.time()
+        second = int(now)
+        if _health_timestamp[0] != second:
+            _health_timestamp = (second, datetime.fromtimestamp(second).isoformat())
+        if now - _health_db_status[0] >= 1.0:
+            _health_db_status = (now, db_manager.test_connection())
+        db_status = _health_db_status[1]
+        
         db_type = "sqlite" if "SQLiteDatabaseManager" in str(type(db_manager)) else "memory"
         return jsonify({
             "status": "healthy" if db_status else "unhealthy",
             "database": f"{db_type}_connected" if db_status else f"{db_type}_disconnected",
             "email_service": "enabled" if email_service and email_service.email_enabled else "disabled",
             "nlp_model": "simplified",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _health_timestamp[1]
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 # ✅ Save chat message
-@app.route("/message", methods=["POST"])
+@api.route("/message", methods=["POST"])
 def save_message():
     try:
         data = request.json
@@ -101,7 +184,7 @@ def save_message():
                 return jsonify({"error": f"Missing required field: {field}"}), 400
         
         # Save message
-        message_id = db_manager.save_message(
+        message_id = db().save_message(
             name=data["name"],
             email=data["email"],
             message=data["message"]
@@ -114,51 +197,56 @@ def save_message():
             }), 201
         else:
             return jsonify({"error": "Failed to save message"}), 500
-            
+    
     except Exception as e:
         print(f"❌ Error saving message: {e}")
         return jsonify({"error": str(e)}), 500
 
 # ✅ Get all chat messages
-@app.route("/messages", methods=["GET"])
+@api.route("/messages", methods=["GET"])
 def get_messages():
     try:
         limit = request.args.get("limit", 100, type=int)
-        messages = db_manager.get_messages(limit=limit)
-        return jsonify(messages)
+        
+        # Opt-in streaming keeps memory flat for large limits
+        if request.args.get("stream", 0, type=int):
+            return ojsonify_stream(db().iter_messages(limit=limit))
+        
+        messages = db().get_messages(limit=limit)
+        return ojsonify(messages)
     except Exception as e:
         print(f"❌ Error getting messages: {e}")
         return jsonify({"error": str(e)}), 500
 
 # ✅ Get messages by user
-@app.route("/messages/user/<email>", methods=["GET"])
+@api.route("/messages/user/<email>", methods=["GET"])
 def get_messages_by_user(email):
     try:
-        messages = db_manager.get_messages_by_user(email)
-        return jsonify(messages)
+        messages = db().get_messages_by_user(email)
+        return ojsonify(messages)
     except Exception as e:
         print(f"❌ Error getting user messages: {e}")
         return jsonify({"error": str(e)}), 500
 
 # ✅ Get all users
-@app.route("/users", methods=["GET"])
+@api.route("/users", methods=["GET"])
 def get_users():
     try:
-        users = db_manager.get_all_users()
-        return jsonify(users)
+        users = db().get_all_users()
+        return ojsonify(users)
     except Exception as e:
         print(f"❌ Error getting users: {e}")
         return jsonify({"error": str(e)}), 500
 
 # ✅ Create user
-@app.route("/users", methods=["POST"])
+@api.route("/users", methods=["POST"])
 def create_user():
     try:
         data = request.json
         if not data or not data.get("name") or not data.get("email"):
             return jsonify({"error": "Name and email are required"}), 400
         
-        user_id = db_manager.create_user(
+        user_id = db().create_user(
             name=data["name"],
             email=data["email"]
         )
@@ -170,7 +258,7 @@ def create_user():
             }), 201
         else:
             return jsonify({"error": "Failed to create user"}), 500
-            
+    
     except Exception as e:
         print(f"❌ Error creating user: {e}")
         return jsonify({"error": str(e)}), 500
@@ -186,14 +274,10 @@ def extract_meeting_details(chat_history):
     # Use the simplified NLP function
     meeting_intent = analyze_meeting_intent(combined_text)
     
-    # Add participants from chat history
-    participants = set()
-    for msg in chat_history:
-        participants.add(msg["email"])
-    
-    # Update participants in the meeting intent
-    meeting_intent.participants.extend(list(participants))
-    meeting_intent.participants = list(set(meeting_intent.participants))  # Remove duplicates
+    # Add participants from chat history, removing duplicates in one pass
+    participants = set(meeting_intent.participants)
+    participants.update(msg["email"] for msg in chat_history)
+    meeting_intent.participants = list(participants)
     
     # Update missing_info based on what we actually have
     missing_info = []
@@ -208,22 +292,68 @@ def extract_meeting_details(chat_history):
     
     return meeting_intent
 
+# ✅ Meeting context cache
+def refresh_meeting_contexts(chat_history=None, version=None):
+    """
+    Rebuild the meeting contexts from the recent chat history and cache them;
+    a given chat_history must come with the messages version read before fetching it
+    """
+    if chat_history is None or version is None:
+        # Read the version first so messages arriving meanwhile invalidate this build
+        version = db().get_messages_version()
+        chat_history = db().get_messages(limit=50)
+    
+    conversation_analyzer = get_conversation_analyzer()
+    meeting_contexts = conversation_analyzer.extract_meeting_contexts(chat_history)
+    db().save_meeting_contexts(version, meeting_contexts)
+    return meeting_contexts
+
+def get_meeting_contexts(chat_history, version):
+    """
+    Get meeting contexts, reusing the cached ones while no messages have changed
+    """
+    cached = db().get_cached_meeting_contexts()
+    if cached and cached["version"] == version:
+        age = time.time() - cached["built_at"]
+        refresh_interval = current_app.config["MEETING_CONTEXTS_REFRESH_INTERVAL"]
+        if refresh_interval <= 0 or age < refresh_interval:
+            return cached["contexts"]
+    return refresh_meeting_contexts(chat_history, version)
+
 # ✅ Schedule meeting route with enhanced logic for multiple meetings
-@app.route("/schedule", methods=["POST"])
+@api.route("/schedule", methods=["POST"])
 def schedule_meeting():
+    # Messages unchanged since the client's last response - skip the NLP pipeline
+    version = db().get_messages_version()
+    etag = f'W/"{version}"' if version >= 0 else None
+    if etag and request.headers.get("If-None-Match") == etag:
+        return "", 304, {"ETag": etag}
+    
+    response = make_response(_schedule_meeting())
+    if etag and response.status_code < 500:
+        response.headers["ETag"] = etag
+    return response
+
+def _schedule_meeting():
+    """
+    Schedule meetings from the recent chat history
+    """
     try:
-        # Get chat history
-        chat_history = db_manager.get_messages(limit=50)
+        email_service = mailer()
+        
+        # Get chat history, with the version read first so the cache never
+        # stores this history under a newer version
+        version = db().get_messages_version()
+        chat_history = db().get_messages(limit=50)
         
         if not chat_history:
             return jsonify({
                 "status": "No messages found",
                 "message": "Please start a conversation first"
             }), 400
-
+        
         # Use conversation analyzer to detect separate meeting contexts
-        conversation_analyzer = get_conversation_analyzer()
-        meeting_contexts = conversation_analyzer.extract_meeting_contexts(chat_history)
+        meeting_contexts = get_meeting_contexts(chat_history, version)
         
         if not meeting_contexts:
             # Fall back to original single meeting logic
@@ -234,7 +364,7 @@ def schedule_meeting():
                     "status": "No meeting intent detected",
                     "message": "No meeting scheduling intent found in the conversation"
                 }), 400
-
+            
             # If missing information, return what's needed
             if meeting_intent.missing_info:
                 return jsonify({
@@ -247,23 +377,23 @@ def schedule_meeting():
                         "participants": meeting_intent.participants
                     }
                 }), 200
-
+            
             # Create single meeting
-            meeting_id = db_manager.create_meeting(
+            meeting_id = db().create_meeting(
                 date=meeting_intent.suggested_date,
                 time=meeting_intent.suggested_time,
                 participants=meeting_intent.participants
             )
-
+            
             if meeting_id:
-                meeting = db_manager.get_meeting_by_id(meeting_id)
+                meeting = db().get_meeting_by_id(meeting_id)
                 
-                # Send confirmation emails
+                # Queue confirmation emails; they are sent in the background
                 if email_service:
-                    email_sent = email_service.send_meeting_confirmation(
+                    email_service.send_meeting_confirmation_async(
                         meeting, meeting_intent.participants
-                    )
-                    print(f"📧 Email confirmation sent: {email_sent}")
+                    ).add_done_callback(_report_email_result)
+                    print("📧 Email confirmation queued")
                 else:
                     print("⚠️ Email service not available - skipping confirmation emails")
                 
@@ -272,20 +402,27 @@ def schedule_meeting():
                     "meeting_id": meeting_id,
                     "details": meeting,
                     "confidence": meeting_intent.confidence,
-                    "email_sent": True if email_service else False
+                    # Sending happens after the response; email_queued is the flag to check
+                    "email_sent": False,
+                    "email_queued": True if email_service else False
                 }), 200
             else:
                 return jsonify({"error": "Failed to schedule meeting"}), 500
-
+        
         # Handle multiple meeting contexts
         scheduled_meetings = []
         total_confidence = 0
         
-        for i, context in enumerate(meeting_contexts):
-            # Extract meeting details for this context
-            context_text = ' '.join([msg.get('message', '') for msg in context['messages']])
-            meeting_intent = analyze_meeting_intent(context_text)
-            
+        # Extract meeting details for all contexts in one batch
+        context_texts = [
+            ' '.join(msg.get('message', '') for msg in context['messages'])
+            for context in meeting_contexts
+        ]
+        meeting_intents = analyze_meeting_intents(context_texts)
+        
+        # Prepare every meeting first so they can be inserted in one transaction
+        meeting_rows = []
+        for context, meeting_intent in zip(meeting_contexts, meeting_intents):
             # Use participants from context
             meeting_intent.participants = context['participants']
             
@@ -293,26 +430,29 @@ def schedule_meeting():
             if context.get('extracted_times'):
                 meeting_intent.suggested_time = context['extracted_times'][0]
             
-            # Create meeting for this context
-            meeting_id = db_manager.create_meeting(
-                date=meeting_intent.suggested_date or "2025-08-04",  # Default date
-                time=meeting_intent.suggested_time or "2:00 PM",  # Default time
-                participants=meeting_intent.participants
-            )
-            
-            if meeting_id:
-                meeting = db_manager.get_meeting_by_id(meeting_id)
+            meeting_rows.append({
+                "date": meeting_intent.suggested_date or "2025-08-04",  # Default date
+                "time": meeting_intent.suggested_time or "2:00 PM",  # Default time
+                "participants": meeting_intent.participants
+            })
+        
+        meeting_ids = db().create_meetings(meeting_rows)
+        
+        for meeting_id, meeting_intent in zip(meeting_ids, meeting_intents):
+            meeting = db().get_meeting_by_id(meeting_id)
+            if meeting:
                 scheduled_meetings.append(meeting)
                 total_confidence += meeting_intent.confidence
-                
-                # Send confirmation emails for this meeting
-                if email_service:
-                    email_sent = email_service.send_meeting_confirmation(
-                        meeting, meeting_intent.participants
-                    )
-                    print(f"📧 Email confirmation sent for meeting {i+1}: {email_sent}")
-                else:
-                    print(f"⚠️ Email service not available for meeting {i+1}")
+        
+        # Queue confirmation emails; they are sent in the background
+        if email_service:
+            for i, meeting in enumerate(scheduled_meetings):
+                email_service.send_meeting_confirmation_async(
+                    meeting, meeting['participants']
+                ).add_done_callback(_report_email_result)
+                print(f"📧 Email confirmation queued for meeting {i+1}")
+        else:
+            print("⚠️ Email service not available - skipping confirmation emails")
         
         if scheduled_meetings:
             avg_confidence = total_confidence / len(scheduled_meetings)
@@ -321,32 +461,47 @@ def schedule_meeting():
                 "meetings": scheduled_meetings,
                 "meeting_count": len(scheduled_meetings),
                 "confidence": avg_confidence,
-                "email_sent": True if email_service else False
+                # Sending happens after the response; email_queued is the flag to check
+                "email_sent": False,
+                "email_queued": True if email_service else False
             }), 200
         else:
             return jsonify({"error": "Failed to schedule any meetings"}), 500
-
+    
     except Exception as e:
         print(f"❌ Error scheduling meeting: {e}")
         return jsonify({"error": str(e)}), 500
 
+# ✅ Rebuild cached meeting contexts
+@api.route("/refresh-contexts", methods=["POST"])
+def refresh_contexts():
+    try:
+        meeting_contexts = refresh_meeting_contexts()
+        return jsonify({
+            "status": "Meeting contexts refreshed",
+            "context_count": len(meeting_contexts)
+        }), 200
+    except Exception as e:
+        print(f"❌ Error refreshing meeting contexts: {e}")
+        return jsonify({"error": str(e)}), 500
+
 # ✅ Get all meetings
-@app.route("/meetings", methods=["GET"])
+@api.route("/meetings", methods=["GET"])
 def get_meetings():
     try:
-        meetings = db_manager.get_meetings()
-        return jsonify(meetings)
+        meetings = db().get_meetings()
+        return ojsonify(meetings)
     except Exception as e:
         print(f"❌ Error getting meetings: {e}")
         return jsonify({"error": str(e)}), 500
 
 # ✅ Get meeting by ID
-@app.route("/meetings/<meeting_id>", methods=["GET"])
+@api.route("/meetings/<meeting_id>", methods=["GET"])
 def get_meeting(meeting_id):
     try:
-        meeting = db_manager.get_meeting_by_id(meeting_id)
+        meeting = db().get_meeting_by_id(meeting_id)
         if meeting:
-            return jsonify(meeting)
+            return ojsonify(meeting)
         else:
             return jsonify({"error": "Meeting not found"}), 404
     except Exception as e:
@@ -354,14 +509,14 @@ def get_meeting(meeting_id):
         return jsonify({"error": str(e)}), 500
 
 # ✅ Update meeting status
-@app.route("/meetings/<meeting_id>/status", methods=["PUT"])
+@api.route("/meetings/<meeting_id>/status", methods=["PUT"])
 def update_meeting_status(meeting_id):
     try:
         data = request.json
         if not data or not data.get("status"):
             return jsonify({"error": "Status is required"}), 400
         
-        success = db_manager.update_meeting_status(meeting_id, data["status"])
+        success = db().update_meeting_status(meeting_id, data["status"])
         if success:
             return jsonify({"status": "Meeting status updated successfully"}), 200
         else:
@@ -371,17 +526,17 @@ def update_meeting_status(meeting_id):
         return jsonify({"error": str(e)}), 500
 
 # ✅ Get statistics
-@app.route("/statistics", methods=["GET"])
+@api.route("/statistics", methods=["GET"])
 def get_statistics():
     try:
-        stats = db_manager.get_chat_statistics()
-        return jsonify(stats)
+        stats = db().get_chat_statistics()
+        return ojsonify(stats)
     except Exception as e:
         print(f"❌ Error getting statistics: {e}")
         return jsonify({"error": str(e)}), 500
 
 # ✅ Test email service
-@app.route("/test-email", methods=["POST"])
+@api.route("/test-email", methods=["POST"])
 def test_email():
     try:
         data = request.json
@@ -390,6 +545,7 @@ def test_email():
         
         test_email = data["email"]
         
+        email_service = mailer()
         if not email_service:
             return jsonify({
                 "error": "Email service not available",
@@ -419,13 +575,13 @@ def test_email():
             }), 200
         else:
             return jsonify({"error": "Failed to send test email"}), 500
-            
+    
     except Exception as e:
         print(f"❌ Error testing email: {e}")
         return jsonify({"error": str(e)}), 500
 
 # ✅ Sample data management
-@app.route("/load-sample-data", methods=["POST"])
+@api.route("/load-sample-data", methods=["POST"])
 def load_sample_data_endpoint():
     """Load sample conversations and meetings for demonstration"""
     try:
@@ -441,7 +597,7 @@ def load_sample_data_endpoint():
         print(f"❌ Error loading sample data: {e}")
         return jsonify({"error": str(e)}), 500
 
-@app.route("/clear-sample-data", methods=["POST"])
+@api.route("/clear-sample-data", methods=["POST"])
 def clear_sample_data_endpoint():
     """Clear all sample data from the database"""
     try:
@@ -457,7 +613,7 @@ def clear_sample_data_endpoint():
         print(f"❌ Error clearing sample data: {e}")
         return jsonify({"error": str(e)}), 500
 
-@app.route("/sample-data-info", methods=["GET"])
+@api.route("/sample-data-info", methods=["GET"])
 def get_sample_data_info():
     """Get information about available sample data"""
     try:
@@ -467,6 +623,31 @@ def get_sample_data_info():
         print(f"❌ Error getting sample data info: {e}")
         return jsonify({"error": str(e)}), 500
 
+# ✅ Application factory
+def create_app():
+    """Create the Flask app; the database and email services start on first use"""
+    # ✅ Load environment variables
+    load_dotenv()
+    
+    # ✅ Database and email modules log through `logging`; routine messages are
+    # INFO/DEBUG and skipped at the default WARNING level
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper(), format="%(message)s")
+    
+    # ✅ Initialize Flask
+    app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    CORS(app)
+    
+    # Cached meeting contexts are rebuilt when messages change; a positive interval
+    # (seconds) additionally rebuilds them once they get older than that
+    app.config["MEETING_CONTEXTS_REFRESH_INTERVAL"] = int(os.getenv("MEETING_CONTEXTS_REFRESH_INTERVAL", "0"))
+    
+    app.register_blueprint(api)
+    
+    # ✅ Load NLP
+    print("✅ Simplified NLP module loaded successfully")
+    return app
+
 # ✅ Run Flask app
 if __name__ == "__main__":
-    app.run(debug=True, host="0.0.0.0", port=5000)
\ No newline at end of file
+    create_app().run(debug=True, host="0.0.0.0", port=5000)
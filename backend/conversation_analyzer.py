@@ -1,7 +1,35 @@
 import re
+import hashlib
+import threading
 from typing import List, Dict, Any, Tuple
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+
+# Patterns are compiled once at import instead of on every analysis call
+_TIME_PATTERNS = [re.compile(p) for p in (
+    r'(\d{1,2}):(\d{2})\s*(am|pm)',
+    r'(\d{1,2})\s*(am|pm)',
+    r'at\s+(\d{1,2})',
+    r'around\s+(\d{1,2})',
+    r'(\d{1,2})\s*o\'?clock'
+)]
+_DATE_KEYWORDS = ('tomorrow', 'today', 'friday', 'monday', 'next week')
+_DATE_PATTERN = re.compile('|'.join(_DATE_KEYWORDS))
+
+# Keywords that mark a message as continuing the current conversation
+_CONTINUITY_KEYWORDS = re.compile('|'.join(map(re.escape, [
+    'meeting', 'schedule', 'available', 'time', 'when', 'how about', 'works for me', 'ok', 'sure', 'yes', 'no'
+])))
+
+# Meeting and time keywords tagged by category in one pattern, so a single scan
+# sets both flags. The lookahead tries every position, which keeps the substring
+# semantics of `in`; no keyword is a prefix of one in the other category.
+_MEETING_KEYWORDS = ['meeting', 'schedule', 'call', 'discussion', 'standup', 'review', 'available', 'time', 'when']
+_TIME_MENTIONS = ['at', 'around', 'about', 'am', 'pm', 'morning', 'afternoon', 'evening']
+_SIGNAL_KEYWORDS = re.compile('(?=(?P<meeting>%s)|(?P<time>%s))' % (
+    '|'.join(map(re.escape, _MEETING_KEYWORDS)),
+    '|'.join(map(re.escape, _TIME_MENTIONS))
+))
 
 class ConversationAnalyzer:
     """Analyzes conversations to detect separate meeting contexts"""
@@ -9,79 +37,75 @@ class ConversationAnalyzer:
     def __init__(self):
         self.time_window_minutes = 30  # Messages within this window are considered related
         self.participant_threshold = 2  # Minimum participants for a meeting
+        
+        # LRU of text analysis results keyed by a digest of the group text and participants
+        self.analysis_cache_size = 128
+        self._analysis_cache = OrderedDict()
+        self._analysis_cache_lock = threading.Lock()
     
     def group_conversations(self, messages: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
         """
         Group messages into separate conversation contexts
         """
+        return [group for group, _, _ in self._group_conversations(messages)]
+    
+    def _group_conversations(self, messages: List[Dict[str, Any]]) -> List[Tuple[List[Dict[str, Any]], List[str], List[str]]]:
+        """
+        Group messages, also collecting each group's message texts and their lowercase forms
+        """
         if not messages:
             return []
         
-        # Sort messages by timestamp
-        sorted_messages = sorted(messages, key=lambda x: x.get('timestamp', ''))
+        # Parse every timestamp once; SQLite already returns messages oldest
+        # first, so only sort when the input is out of order
+        parsed = [(self._parse_timestamp(msg.get('timestamp', '')), msg) for msg in messages]
+        if any(parsed[i][0] > parsed[i + 1][0] for i in range(len(parsed) - 1)):
+            parsed.sort(key=lambda item: item[0])
         
         conversation_groups = []
         current_group = []
-        
-        for i, message in enumerate(sorted_messages):
-            if not current_group:
-                current_group.append(message)
-                continue
+        text_parts = []
+        lower_parts = []
+        group_start = None
+        group_participants = set()
+        group_has_keyword = False
+        
+        for timestamp, message in parsed:
+            participant = message.get('email', '')
+            text = message.get('message', '')
+            lower = text.lower()
+            has_keyword = _CONTINUITY_KEYWORDS.search(lower) is not None
             
-            # Check if this message belongs to current group
-            if self._is_related_message(message, current_group):
-                current_group.append(message)
-            else:
-                # Start new group - be more strict about participant separation
-                if len(current_group) >= 1:  # Allow single message groups for better separation
-                    conversation_groups.append(current_group)
-                current_group = [message]
+            if current_group:
+                # Check time proximity against the group's earliest message
+                # (15 minutes rather than 30 for stricter separation)
+                within_window = abs((timestamp - group_start).total_seconds() / 60) <= 15
+                
+                # Check participant overlap - this is the key for separating conversations;
+                # then require continuity keywords in the message or the group so far
+                if within_window and participant in group_participants and (has_keyword or group_has_keyword):
+                    current_group.append(message)
+                    text_parts.append(text)
+                    lower_parts.append(lower)
+                    group_start = min(group_start, timestamp)
+                    group_has_keyword = group_has_keyword or has_keyword
+                    continue
+                
+                # Start new group - single message groups are allowed for better separation
+                conversation_groups.append((current_group, text_parts, lower_parts))
+            
+            current_group = [message]
+            text_parts = [text]
+            lower_parts = [lower]
+            group_start = timestamp
+            group_participants = {participant}
+            group_has_keyword = has_keyword
         
         # Add the last group
-        if len(current_group) >= 1:
-            conversation_groups.append(current_group)
+        conversation_groups.append((current_group, text_parts, lower_parts))
         
         return conversation_groups
     
-    def _is_related_message(self, message: Dict[str, Any], group: List[Dict[str, Any]]) -> bool:
-        """
-        Determine if a message is related to the current conversation group
-        """
-        if not group:
-            return True
-        
-        # Check time proximity (shorter window for better separation)
-        current_time = self._parse_timestamp(message.get('timestamp', ''))
-        group_times = [self._parse_timestamp(msg.get('timestamp', '')) for msg in group]
-        
-        if current_time and group_times:
-            time_diff = abs((current_time - min(group_times)).total_seconds() / 60)
-            if time_diff > 15:  # Reduced from 30 to 15 minutes for stricter separation
-                return False
-        
-        # Check participant overlap - this is the key for separating conversations
-        group_participants = set(msg.get('email', '') for msg in group)
-        current_participant = message.get('email', '')
-        
-        # If current participant is NOT in the group, start a new conversation
-        if current_participant not in group_participants:
-            return False
-        
-        # Check for conversation continuity keywords
-        continuity_keywords = ['meeting', 'schedule', 'available', 'time', 'when', 'how about', 'works for me', 'ok', 'sure', 'yes', 'no']
-        message_text = message.get('message', '').lower()
-        group_text = ' '.join([msg.get('message', '').lower() for msg in group])
-        
-        # If current message contains meeting-related keywords, likely related
-        if any(keyword in message_text for keyword in continuity_keywords):
-            return True
-        
-        # If group contains meeting-related keywords, likely related
-        if any(keyword in group_text for keyword in continuity_keywords):
-            return True
-        
-        return False
-    
     def _parse_timestamp(self, timestamp_str: str) -> datetime:
         """Parse timestamp string to datetime object"""
         try:
@@ -98,35 +122,75 @@ class ConversationAnalyzer:
         """
         Extract separate meeting contexts from conversation groups
         """
-        conversation_groups = self.group_conversations(messages)
+        conversation_groups = self._group_conversations(messages)
         meeting_contexts = []
         
-        for group in conversation_groups:
-            context = self._analyze_group_context(group)
+        for group, text_parts, lower_parts in conversation_groups:
+            context = self._analyze_group_context(group, text_parts, lower_parts)
             if context and context.get('participants'):
                 meeting_contexts.append(context)
         
         return meeting_contexts
     
-    def _analyze_group_context(self, group: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_group_context(self, group: List[Dict[str, Any]], text_parts: List[str] = None,
+                               lower_parts: List[str] = None) -> Dict[str, Any]:
         """
         Analyze a conversation group to extract meeting context
         """
-        participants = list(set(msg.get('email', '') for msg in group))
-        messages_text = ' '.join([msg.get('message', '') for msg in group])
-        
-        # Extract time patterns
-        time_patterns = [
-            r'(\d{1,2}):(\d{2})\s*(am|pm)',
-            r'(\d{1,2})\s*(am|pm)',
-            r'at\s+(\d{1,2})',
-            r'around\s+(\d{1,2})',
-            r'(\d{1,2})\s*o\'?clock'
-        ]
+        # Unique participants in order of first message
+        participants = list({msg.get('email', ''): None for msg in group})
         
+        # Reuse the texts collected while grouping when they are passed in
+        if text_parts is None:
+            text_parts = [msg.get('message', '') for msg in group]
+        messages_text = ' '.join(text_parts)
+        lower_text = ' '.join(lower_parts) if lower_parts is not None else messages_text.lower()
+        
+        extracted_times, extracted_dates, has_meeting_intent, has_time_mention = \
+            self._analyze_text_cached(lower_text, participants)
+        
+        # If we have participants and either meeting intent or time mentions, create context
+        if participants and (has_meeting_intent or has_time_mention):
+            return {
+                'participants': participants,
+                'messages': group,
+                'extracted_times': list(extracted_times),
+                'extracted_dates': list(extracted_dates),
+                'context_text': messages_text[:200] + '...' if len(messages_text) > 200 else messages_text,
+                'message_count': len(group)
+            }
+        
+        return None
+    
+    def _analyze_text_cached(self, lower: str, participants: List[str]) -> Tuple[Tuple[str, ...], Tuple[str, ...], bool, bool]:
+        """
+        Analyze lowercase group text, reusing the result for text and participants seen recently
+        """
+        key_source = lower + "|" + ",".join(sorted(participants))
+        key = hashlib.blake2b(key_source.encode(), digest_size=16).digest()
+        
+        with self._analysis_cache_lock:
+            result = self._analysis_cache.get(key)
+            if result is not None:
+                self._analysis_cache.move_to_end(key)
+                return result
+        
+        result = self._analyze_text(lower)
+        
+        with self._analysis_cache_lock:
+            self._analysis_cache[key] = result
+            self._analysis_cache.move_to_end(key)
+            while len(self._analysis_cache) > self.analysis_cache_size:
+                self._analysis_cache.popitem(last=False)
+        return result
+    
+    def _analyze_text(self, lower: str) -> Tuple[Tuple[str, ...], Tuple[str, ...], bool, bool]:
+        """
+        Extract times, dates and scheduling signals from a conversation group's lowercase text
+        """
         extracted_times = []
-        for pattern in time_patterns:
-            matches = re.findall(pattern, messages_text.lower())
+        for pat in _TIME_PATTERNS:
+            matches = pat.findall(lower)
             for match in matches:
                 if isinstance(match, tuple):
                     if len(match) == 3:  # hour:minute am/pm
@@ -136,59 +200,35 @@ class ConversationAnalyzer:
                         hour, ampm = match
                         time_str = f"{hour}:00 {ampm.upper()}"
                     else:
-                        hour = int(match[0])
-                        # Business context: Most meetings are during business hours
-                        # 5-12 without AM/PM is typically PM (afternoon/evening)
-                        # 1-4 without AM/PM is typically PM (afternoon)
-                        # 6-11 without AM/PM is typically AM (morning)
-                        if hour >= 5 and hour <= 12:
-                            time_str = f"{hour}:00 PM"
-                        elif hour >= 1 and hour <= 4:
-                            time_str = f"{hour}:00 PM"
-                        elif hour >= 6 and hour <= 11:
-                            time_str = f"{hour}:00 AM"
-                        elif hour == 12:
-                            time_str = "12:00 PM"
-                        else:
-                            # Default to PM for business hours
-                            time_str = f"{hour}:00 PM"
+                        # Business context: an hour without AM/PM is read as PM.
+                        # The old ladder's 6-11 AM branch was unreachable behind 5-12 PM,
+                        # so every hour resolves to PM.
+                        time_str = f"{int(match[0])}:00 PM"
                     extracted_times.append(time_str)
         
-        # Extract date patterns
-        date_patterns = [
-            r'tomorrow',
-            r'today',
-            r'friday',
-            r'monday',
-            r'next week'
-        ]
-        
-        extracted_dates = []
-        for pattern in date_patterns:
-            if re.search(pattern, messages_text.lower()):
-                extracted_dates.append(pattern)
+        # Extract date patterns with a single scan, reported in keyword order
+        found_dates = set(_DATE_PATTERN.findall(lower))
+        extracted_dates = [keyword for keyword in _DATE_KEYWORDS if keyword in found_dates]
         
-        # Determine meeting intent - be more flexible
-        meeting_keywords = ['meeting', 'schedule', 'call', 'discussion', 'standup', 'review', 'available', 'time', 'when']
-        has_meeting_intent = any(keyword in messages_text.lower() for keyword in meeting_keywords)
-        
-        # Also check if there are time mentions (suggests scheduling)
-        time_mentions = ['at', 'around', 'about', 'am', 'pm', 'morning', 'afternoon', 'evening']
-        has_time_mention = any(time_word in messages_text.lower() for time_word in time_mentions)
-        
-        # If we have participants and either meeting intent or time mentions, create context
-        if participants and (has_meeting_intent or has_time_mention):
-            return {
-                'participants': participants,
-                'messages': group,
-                'extracted_times': extracted_times,
-                'extracted_dates': extracted_dates,
-                'context_text': messages_text[:200] + '...' if len(messages_text) > 200 else messages_text,
-                'message_count': len(group)
-            }
+        # Meeting intent and time mentions (suggests scheduling) in one scan
+        has_meeting_intent = False
+        has_time_mention = False
+        for match in _SIGNAL_KEYWORDS.finditer(lower):
+            if match.lastgroup == 'meeting':
+                has_meeting_intent = True
+            else:
+                has_time_mention = True
+            if has_meeting_intent and has_time_mention:
+                break
         
-        return None
+        return tuple(extracted_times), tuple(extracted_dates), has_meeting_intent, has_time_mention
+
+# Global conversation analyzer instance
+conversation_analyzer = None
 
 def get_conversation_analyzer() -> ConversationAnalyzer:
     """Get conversation analyzer instance"""
-    return ConversationAnalyzer() 
\ No newline at end of file
+    global conversation_analyzer
+    if conversation_analyzer is None:
+        conversation_analyzer = ConversationAnalyzer()
+    return conversation_analyzer 
\ No newline at end of file
@@ -1,14 +1,89 @@
-from pymongo import MongoClient
-from pymongo.errors import ServerSelectionTimeoutError, DuplicateKeyError
+from pymongo import MongoClient, InsertOne
+from bson import ObjectId
+from bson.codec_options import CodecOptions
+from pymongo.errors import ServerSelectionTimeoutError, DuplicateKeyError, BulkWriteError
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 import os
+import logging
+import functools
+import threading
+import time
+from collections import OrderedDict
 from dotenv import load_dotenv
 from models import User, Message, Meeting, MeetingIntent
 
+logger = logging.getLogger(__name__)
+
 # Load environment variables
 load_dotenv()
 
+# Message fields returned to callers (_id is always included)
+MESSAGE_PROJECTION = {"name": 1, "email": 1, "message": 1, "timestamp": 1}
+
+# Equality on email, then the timestamp sort
+MESSAGES_BY_USER_INDEX = [("email", 1), ("timestamp", -1)]
+
+# Documents fetched per round trip when streaming a cursor
+STREAM_BATCH_SIZE = 500
+
+@functools.lru_cache(maxsize=4096)
+def _oid(meeting_id: str) -> ObjectId:
+    """Parse a hex id, reusing the result for ids seen recently"""
+    return ObjectId(meeting_id)
+
+def _iter_with_ids(cursor) -> Iterator[Dict[str, Any]]:
+    """Yield a cursor's documents one at a time, exposing each _id as a string id"""
+    str_ = str
+    for doc in cursor.batch_size(STREAM_BATCH_SIZE):
+        doc["id"] = str_(doc.pop("_id"))
+        yield doc
+
+def _with_ids(cursor) -> List[Dict[str, Any]]:
+    """Drain a cursor, exposing each document's _id as a string id"""
+    str_ = str
+    docs = []
+    for doc in cursor:
+        doc["id"] = str_(doc.pop("_id"))
+        docs.append(doc)
+    return docs
+
+class _TTLCache:
+    """Thread-safe LRU cache whose entries expire after `ttl` seconds"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Get a live entry, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key, value):
+        """Store an entry, evicting the least recently used ones past maxsize"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def pop(self, key):
+        """Drop an entry if present"""
+        with self._lock:
+            self._entries.pop(key, None)
+
 class DatabaseManager:
     def __init__(self):
         self.mongo_uri = os.getenv("MONGO_URI")
@@ -24,17 +99,37 @@ class DatabaseManager:
             ssl=True,
             tlsAllowInvalidCertificates=True,
             tlsAllowInvalidHostnames=True,
-            tlsInsecure=True,
             directConnection=False,
             retryWrites=True,
-            w='majority'
+            w='majority',
+            # Bounded, pre-warmed pool so TLS handshakes are shared across requests
+            maxPoolSize=200,
+            minPoolSize=10,
+            maxIdleTimeMS=300_000,
+            waitQueueTimeoutMS=10_000,
+            # Cap concurrent handshakes so warming the pool doesn't stampede the server
+            maxConnecting=4
         )
         self.db = self.client["meeting_scheduler"]
         
-        # Collections
-        self.users = self.db["users"]
-        self.messages = self.db["messages"]
-        self.meetings = self.db["meetings"]
+        # Open the first connection now instead of on the first request
+        try:
+            self.client.admin.command('ping')
+        except Exception as e:
+            logger.warning("⚠️ Warning: Initial database ping failed: %s", e)
+        
+        # Collections decode into plain dicts with naive datetimes, skipping tz conversion
+        codec_options = CodecOptions(document_class=dict, tz_aware=False)
+        self.users = self.db.get_collection("users", codec_options=codec_options)
+        self.messages = self.db.get_collection("messages", codec_options=codec_options)
+        self.meetings = self.db.get_collection("meetings", codec_options=codec_options)
+        
+        # Runs independent queries side by side on the client's connection pool
+        self._query_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mongo-query")
+        
+        # Users change rarely; a short-lived cache skips repeat lookups. Meetings are
+        # not cached, since a status change in one worker would stay stale in the others
+        self._user_cache = _TTLCache(maxsize=10_000, ttl=60)
         
         # Create indexes
         self._create_indexes()
@@ -45,27 +140,28 @@ class DatabaseManager:
             # Users collection indexes
             self.users.create_index("email", unique=True)
             
-            # Messages collection indexes
+            # Messages collection indexes - equality on email, then the timestamp sort
             self.messages.create_index("timestamp")
-            self.messages.create_index("email")
+            self.messages.create_index(MESSAGES_BY_USER_INDEX)
             
-            # Meetings collection indexes
+            # Meetings collection indexes - the compound indexes also serve
+            # status-only and participant-only lookups through their prefix
             self.meetings.create_index("date")
-            self.meetings.create_index("participants")
-            self.meetings.create_index("status")
+            self.meetings.create_index([("status", 1), ("date", 1)])
+            self.meetings.create_index([("participants", 1), ("date", 1)])
             
-            print("✅ Database indexes created successfully")
+            logger.info("✅ Database indexes created successfully")
         except Exception as e:
-            print(f"⚠️ Warning: Could not create indexes: {e}")
+            logger.warning("⚠️ Warning: Could not create indexes: %s", e)
     
     def test_connection(self) -> bool:
         """Test database connection"""
         try:
             self.client.admin.command('ping')
-            print("✅ Database connection successful")
+            logger.info("✅ Database connection successful")
             return True
         except ServerSelectionTimeoutError as e:
-            print(f"❌ Database connection failed: {e}")
+            logger.error("❌ Database connection failed: %s", e)
             return False
     
     # User operations
@@ -78,38 +174,82 @@ class DatabaseManager:
                 "created_at": datetime.now()
             }
             result = self.users.insert_one(user_data)
+            self._user_cache.pop(email)
             return str(result.inserted_id)
         except DuplicateKeyError:
-            print(f"⚠️ User with email {email} already exists")
+            logger.warning("⚠️ User with email %s already exists", email)
             return None
         except Exception as e:
-            print(f"❌ Error creating user: {e}")
+            logger.error("❌ Error creating user: %s", e)
             return None
     
+    def create_users_bulk(self, users: List[Dict[str, Any]]) -> List[str]:
+        """Create several users in one round trip, skipping emails that already exist"""
+        if not users:
+            return []
+        try:
+            now = datetime.now()
+            user_docs = [
+                {"name": user["name"], "email": user["email"], "created_at": now}
+                for user in users
+            ]
+            failed = set()
+            try:
+                # InsertOne assigns each document its _id before sending
+                self.users.bulk_write([InsertOne(doc) for doc in user_docs], ordered=False)
+            except BulkWriteError as e:
+                failed = {error["index"] for error in e.details.get("writeErrors", [])}
+                logger.warning("⚠️ %s users already exist", len(failed))
+            for doc in user_docs:
+                self._user_cache.pop(doc["email"])
+            return [str(doc["_id"]) for i, doc in enumerate(user_docs) if i not in failed]
+        except Exception as e:
+            logger.error("❌ Error creating users: %s", e)
+            return []
+    
     def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """Get user by email"""
         try:
+            user = self._user_cache.get(email)
+            if user is not None:
+                return dict(user)
+            
             user = self.users.find_one({"email": email})
             if user:
-                user["id"] = str(user["_id"])
-                del user["_id"]
+                user["id"] = str(user.pop("_id"))
+                self._user_cache.set(email, dict(user))
             return user
         except Exception as e:
-            print(f"❌ Error getting user: {e}")
+            logger.error("❌ Error getting user: %s", e)
+            return None
+    
+    def get_user_id_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """Get only a user's id and name by email; prefer this when the full profile is not needed"""
+        try:
+            user = self.users.find_one({"email": email}, {"_id": 1, "name": 1})
+            if user:
+                return {"id": str(user["_id"]), "name": user.get("name")}
+            return None
+        except Exception as e:
+            logger.error("❌ Error getting user id: %s", e)
             return None
     
     def get_all_users(self) -> List[Dict[str, Any]]:
         """Get all users"""
         try:
-            users = list(self.users.find({}))
-            for user in users:
-                user["id"] = str(user["_id"])
-                del user["_id"]
+            users = _with_ids(self.users.find({}))
             return users
         except Exception as e:
-            print(f"❌ Error getting users: {e}")
+            logger.error("❌ Error getting users: %s", e)
             return []
     
+    def iter_users(self) -> Iterator[Dict[str, Any]]:
+        """Yield all users without buffering the whole collection"""
+        try:
+            yield from _iter_with_ids(self.users.find({}))
+        except Exception as e:
+            logger.error("❌ Error streaming users: %s", e)
+    
     # Message operations
     def save_message(self, name: str, email: str, message: str) -> Optional[str]:
         """Save a new message"""
@@ -123,31 +263,75 @@ class DatabaseManager:
             result = self.messages.insert_one(message_data)
             return str(result.inserted_id)
         except Exception as e:
-            print(f"❌ Error saving message: {e}")
+            logger.error("❌ Error saving message: %s", e)
             return None
     
+    def save_messages_bulk(self, messages: List[Dict[str, Any]]) -> List[str]:
+        """Save several messages in one round trip"""
+        if not messages:
+            return []
+        try:
+            now = datetime.now()
+            message_docs = [
+                {"name": msg["name"], "email": msg["email"], "message": msg["message"], "timestamp": now}
+                for msg in messages
+            ]
+            result = self.messages.insert_many(message_docs, ordered=False)
+            return [str(message_id) for message_id in result.inserted_ids]
+        except Exception as e:
+            logger.error("❌ Error saving messages: %s", e)
+            return []
+    
     def get_messages(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get all messages with optional limit"""
         try:
-            messages = list(self.messages.find({}).sort("timestamp", -1).limit(limit))
-            for message in messages:
-                message["id"] = str(message["_id"])
-                del message["_id"]
-            return messages[::-1]  # Reverse to show oldest first
+            # Newest `limit` messages need the descending sort; flip them in place afterwards.
+            # A bulk insert shares one timestamp, so _id (assigned in list order) breaks ties
+            messages = _with_ids(
+                self.messages.find({}, MESSAGE_PROJECTION).sort([("timestamp", -1), ("_id", -1)]).limit(limit)
+            )
+            messages.reverse()  # Reverse to show oldest first
+            return messages
         except Exception as e:
-            print(f"❌ Error getting messages: {e}")
+            logger.error("❌ Error getting messages: %s", e)
             return []
     
+    def iter_messages(self, limit: int = 100) -> Iterator[Dict[str, Any]]:
+        """Yield the newest `limit` messages oldest first without buffering them"""
+        started = False
+        try:
+            # Find the oldest message that still makes the cut, then stream forward from it
+            cutoff = None
+            if limit > 0:
+                cutoff = self.messages.find_one(
+                    {}, {"timestamp": 1}, sort=[("timestamp", -1), ("_id", -1)], skip=limit - 1
+                )
+            query = {}
+            if cutoff is not None:
+                query = {"$or": [
+                    {"timestamp": {"$gt": cutoff["timestamp"]}},
+                    {"timestamp": cutoff["timestamp"], "_id": {"$gte": cutoff["_id"]}}
+                ]}
+            cursor = self.messages.find(query, MESSAGE_PROJECTION).sort([("timestamp", 1), ("_id", 1)])
+            for message in _iter_with_ids(cursor):
+                started = True
+                yield message
+        except Exception as e:
+            # Once documents went out, a short stream must not pass for a complete one
+            if started:
+                raise
+            logger.error("❌ Error streaming messages: %s", e)
+    
     def get_messages_by_user(self, email: str) -> List[Dict[str, Any]]:
         """Get messages by specific user"""
         try:
-            messages = list(self.messages.find({"email": email}).sort("timestamp", -1))
-            for message in messages:
-                message["id"] = str(message["_id"])
-                del message["_id"]
-            return messages[::-1]
+            # No limit here, so the server can sort oldest first directly;
+            # the hint keeps the planner from drifting to the timestamp-only index
+            cursor = self.messages.find({"email": email}, MESSAGE_PROJECTION).hint(MESSAGES_BY_USER_INDEX)
+            messages = _with_ids(cursor.sort("timestamp", 1))
+            return messages
         except Exception as e:
-            print(f"❌ Error getting user messages: {e}")
+            logger.error("❌ Error getting user messages: %s", e)
             return []
     
     # Meeting operations
@@ -167,57 +351,64 @@ class DatabaseManager:
             result = self.meetings.insert_one(meeting_data)
             return str(result.inserted_id)
         except Exception as e:
-            print(f"❌ Error creating meeting: {e}")
+            logger.error("❌ Error creating meeting: %s", e)
             return None
     
     def get_meetings(self) -> List[Dict[str, Any]]:
         """Get all meetings"""
         try:
-            meetings = list(self.meetings.find({}).sort("created_at", -1))
-            for meeting in meetings:
-                meeting["id"] = str(meeting["_id"])
-                del meeting["_id"]
+            meetings = _with_ids(self.meetings.find({}).sort("created_at", -1))
             return meetings
         except Exception as e:
-            print(f"❌ Error getting meetings: {e}")
+            logger.error("❌ Error getting meetings: %s", e)
             return []
     
+    def iter_meetings(self) -> Iterator[Dict[str, Any]]:
+        """Yield all meetings, newest first, without buffering the whole collection"""
+        try:
+            yield from _iter_with_ids(self.meetings.find({}).sort("created_at", -1))
+        except Exception as e:
+            logger.error("❌ Error streaming meetings: %s", e)
+    
     def get_meeting_by_id(self, meeting_id: str) -> Optional[Dict[str, Any]]:
         """Get meeting by ID"""
         try:
-            from bson import ObjectId
-            meeting = self.meetings.find_one({"_id": ObjectId(meeting_id)})
+            meeting = self.meetings.find_one({"_id": _oid(meeting_id)})
             if meeting:
-                meeting["id"] = str(meeting["_id"])
-                del meeting["_id"]
+                meeting["id"] = str(meeting.pop("_id"))
             return meeting
         except Exception as e:
-            print(f"❌ Error getting meeting: {e}")
+            logger.error("❌ Error getting meeting: %s", e)
             return None
     
     def update_meeting_status(self, meeting_id: str, status: str) -> bool:
         """Update meeting status"""
         try:
-            from bson import ObjectId
             result = self.meetings.update_one(
-                {"_id": ObjectId(meeting_id)},
+                {"_id": _oid(meeting_id)},
                 {"$set": {"status": status}}
             )
             return result.modified_count > 0
         except Exception as e:
-            print(f"❌ Error updating meeting status: {e}")
+            logger.error("❌ Error updating meeting status: %s", e)
             return False
     
     # Analytics and reporting
     def get_chat_statistics(self) -> Dict[str, Any]:
         """Get chat statistics"""
         try:
-            total_messages = self.messages.count_documents({})
-            total_users = self.users.count_documents({})
-            total_meetings = self.meetings.count_documents({})
-            
-            # Get unique participants
-            unique_participants = len(self.messages.distinct("email"))
+            # The four round trips are independent, so issue them concurrently.
+            # Unfiltered totals come from collection metadata instead of a scan.
+            futures = [
+                self._query_executor.submit(self.messages.estimated_document_count),
+                self._query_executor.submit(self.users.estimated_document_count),
+                self._query_executor.submit(self.meetings.estimated_document_count),
+                # Get unique participants, counted on the server
+                self._query_executor.submit(self._count_unique_participants)
+            ]
+            total_messages, total_users, total_meetings, unique_participants = [
+                future.result() for future in futures
+            ]
             
             return {
                 "total_messages": total_messages,
@@ -226,16 +417,25 @@ class DatabaseManager:
                 "unique_participants": unique_participants
             }
         except Exception as e:
-            print(f"❌ Error getting statistics: {e}")
+            logger.error("❌ Error getting statistics: %s", e)
             return {}
     
+    def _count_unique_participants(self) -> int:
+        """Count distinct message senders without shipping the emails back"""
+        result = list(self.messages.aggregate([
+            {"$group": {"_id": "$email"}},
+            {"$count": "n"}
+        ]))
+        return result[0]["n"] if result else 0
+    
     def close_connection(self):
         """Close database connection"""
         try:
+            self._query_executor.shutdown(wait=False)
             self.client.close()
-            print("✅ Database connection closed")
+            logger.info("✅ Database connection closed")
         except Exception as e:
-            print(f"❌ Error closing connection: {e}")
+            logger.error("❌ Error closing connection: %s", e)
 
 # Global database instance
 db_manager = None
@@ -246,3 +446,12 @@ def get_db_manager() -> DatabaseManager:
     if db_manager is None:
         db_manager = DatabaseManager()
     return db_manager
+
+def _reset_db_manager():
+    """Drop the inherited instance so a forked worker builds its own client and pool"""
+    global db_manager
+    db_manager = None
+
+# MongoClient is not fork-safe; one client per process, created after fork
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_db_manager)
@@ -1,7 +1,14 @@
 import os
+import logging
+from email import policy
+from email.message import EmailMessage
+from concurrent.futures import Future
 from datetime import datetime
 from typing import List, Optional
 from dotenv import load_dotenv
+from email_service import SMTPConnectionPool, get_email_executor
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
@@ -18,10 +25,15 @@ class DemoEmailService:
         # Check if real email configuration is available
         self.real_email_enabled = bool(self.smtp_username and self.smtp_password)
         
+        # Real sends reuse logged-in SMTP connections
+        self._smtp_pool = SMTPConnectionPool(
+            self.smtp_server, self.smtp_port, self.smtp_username, self.smtp_password
+        )
+        
         if self.real_email_enabled:
-            print("✅ Real email service available - will send actual emails")
+            logger.info("✅ Real email service available - will send actual emails")
         else:
-            print("🔄 Demo email service enabled - emails will be simulated")
+            logger.info("🔄 Demo email service enabled - emails will be simulated")
         
         # Demo mode is always enabled for testing
         self.email_enabled = True
@@ -36,14 +48,14 @@ class DemoEmailService:
                 server.starttls()
                 server.login(self.smtp_username, self.smtp_password)
                 server.quit()
-                print("✅ Real email connection test successful")
+                logger.info("✅ Real email connection test successful")
                 return True
             except Exception as e:
-                print(f"❌ Real email connection test failed: {e}")
+                logger.error("❌ Real email connection test failed: %s", e)
                 return False
         else:
             # Simulate successful connection
-            print("✅ Demo email connection test successful (simulated)")
+            logger.info("✅ Demo email connection test successful (simulated)")
             return True
     
     def send_meeting_confirmation(self, meeting_data: dict, participants: List[str]) -> bool:
@@ -58,10 +70,13 @@ class DemoEmailService:
             meeting_title = meeting_data.get('title', 'Team Meeting')
             meeting_description = meeting_data.get('description', 'No description provided')
             
+            # Body is rendered once per meeting and shared by every recipient
+            generated_on = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            
             # Create email body
             email_body = self._create_meeting_confirmation_text(
                 meeting_title, meeting_date, meeting_time, 
-                meeting_description, participants
+                meeting_description, participants, generated_on
             )
             
             # Send to each participant
@@ -69,16 +84,20 @@ class DemoEmailService:
             for participant_email in participants:
                 if self._send_email(participant_email, subject, email_body):
                     success_count += 1
-                    print(f"✅ Confirmation email sent to {participant_email}")
+                    logger.debug("✅ Confirmation email sent to %s", participant_email)
                 else:
-                    print(f"❌ Failed to send email to {participant_email}")
+                    logger.error("❌ Failed to send email to %s", participant_email)
             
             return success_count > 0
             
         except Exception as e:
-            print(f"❌ Error sending meeting confirmation: {e}")
+            logger.error("❌ Error sending meeting confirmation: %s", e)
             return False
     
+    def send_meeting_confirmation_async(self, meeting_data: dict, participants: List[str]) -> Future:
+        """Queue meeting confirmation emails on the background sender"""
+        return get_email_executor().submit(self.send_meeting_confirmation, meeting_data, participants)
+    
     def send_meeting_reminder(self, meeting_data: dict, participants: List[str]) -> bool:
         """Send meeting reminder email"""
         try:
@@ -88,8 +107,9 @@ class DemoEmailService:
             meeting_time = meeting_data.get('time', 'TBD')
             meeting_title = meeting_data.get('title', 'Team Meeting')
             
+            generated_on = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             email_body = self._create_meeting_reminder_text(
-                meeting_title, meeting_date, meeting_time, participants
+                meeting_title, meeting_date, meeting_time, participants, generated_on
             )
             
             success_count = 0
@@ -100,7 +120,7 @@ class DemoEmailService:
             return success_count > 0
             
         except Exception as e:
-            print(f"❌ Error sending meeting reminder: {e}")
+            logger.error("❌ Error sending meeting reminder: %s", e)
             return False
     
     def _send_email(self, to_email: str, subject: str, body: str) -> bool:
@@ -108,40 +128,34 @@ class DemoEmailService:
         try:
             if self.real_email_enabled:
                 # Send real email
-                import smtplib
-                from email.mime.text import MIMEText
-                from email.mime.multipart import MIMEMultipart
-                
-                msg = MIMEMultipart('alternative')
+                msg = EmailMessage(policy=policy.SMTP)
                 msg['Subject'] = subject
                 msg['From'] = self.smtp_username
                 msg['To'] = to_email
+                msg.set_content(body)
                 
-                text_part = MIMEText(body, 'plain')
-                msg.attach(text_part)
-                
-                server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-                server.starttls()
-                server.login(self.smtp_username, self.smtp_password)
-                server.send_message(msg)
-                server.quit()
+                with self._smtp_pool.session() as server:
+                    server.sendmail(self.smtp_username, [to_email], msg.as_bytes())
                 
                 return True
             else:
                 # Simulate email sending
-                print(f"📧 [DEMO] Email would be sent to: {to_email}")
-                print(f"📧 [DEMO] Subject: {subject}")
-                print(f"📧 [DEMO] Body: {body[:100]}...")
-                print("📧 [DEMO] Email simulation successful")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("📧 [DEMO] Email would be sent to: %s", to_email)
+                    logger.debug("📧 [DEMO] Subject: %s", subject)
+                    logger.debug("📧 [DEMO] Body: %s...", body[:100])
+                    logger.debug("📧 [DEMO] Email simulation successful")
                 return True
                 
         except Exception as e:
-            print(f"❌ Error sending email to {to_email}: {e}")
+            logger.error("❌ Error sending email to %s: %s", to_email, e)
             return False
     
     def _create_meeting_confirmation_text(self, title: str, date: str, time: str, 
-                                        description: str, participants: List[str]) -> str:
+                                        description: str, participants: List[str],
+                                        generated_on: str = None) -> str:
         """Create plain text email body for meeting confirmation"""
+        generated_on = generated_on or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         return f"""
 Meeting Confirmation
 
@@ -157,12 +171,13 @@ If you need to make any changes, please contact the meeting organizer.
 
 ---
 Generated by Meeting Scheduler AI Assistant
-{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+{generated_on}
         """
     
     def _create_meeting_reminder_text(self, title: str, date: str, time: str, 
-                                     participants: List[str]) -> str:
+                                     participants: List[str], generated_on: str = None) -> str:
         """Create plain text email body for meeting reminder"""
+        generated_on = generated_on or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         return f"""
 Meeting Reminder
 
@@ -175,7 +190,7 @@ This is a reminder for your upcoming meeting. Please be prepared and join on tim
 
 ---
 Generated by Meeting Scheduler AI Assistant
-{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+{generated_on}
         """
 
 # Global demo email service instance
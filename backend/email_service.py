@@ -1,15 +1,74 @@
 import smtplib
 import os
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import logging
+import queue
+from contextlib import contextmanager
+from email import policy
+from email.message import EmailMessage
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Optional
 from dotenv import load_dotenv
 from models import EmailNotification
 
+logger = logging.getLogger(__name__)
+
 # Load environment variables
 load_dotenv()
 
+# Concurrent SMTP sessions used to send one meeting's emails; also the pool size
+SMTP_PARALLEL_SESSIONS = 4
+
+class SMTPConnectionPool:
+    """Small pool of logged-in SMTP connections reused across sends"""
+    
+    def __init__(self, smtp_server: str, smtp_port: int, username: str, password: str, size: int = SMTP_PARALLEL_SESSIONS):
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.username = username
+        self.password = password
+        self._idle = queue.Queue(maxsize=size)
+    
+    @contextmanager
+    def session(self):
+        """Borrow a logged-in connection, opening one when none is idle"""
+        server = self._get_idle()
+        if server is None:
+            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+            server.starttls()
+            server.login(self.username, self.password)
+        try:
+            yield server
+        except Exception:
+            self._close(server)
+            raise
+        try:
+            self._idle.put_nowait(server)
+        except queue.Full:
+            self._close(server)
+    
+    def _get_idle(self) -> Optional[smtplib.SMTP]:
+        """Take an idle connection that still answers NOOP"""
+        while True:
+            try:
+                server = self._idle.get_nowait()
+            except queue.Empty:
+                return None
+            try:
+                if server.noop()[0] == 250:
+                    return server
+            except Exception:
+                pass
+            self._close(server)
+    
+    @staticmethod
+    def _close(server: smtplib.SMTP):
+        """Quit a connection, ignoring errors from dead sessions"""
+        try:
+            server.quit()
+        except Exception:
+            pass
+
 class EmailService:
     def __init__(self):
         self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
@@ -20,10 +79,15 @@ class EmailService:
         # Check if email configuration is available
         self.email_enabled = bool(self.smtp_username and self.smtp_password)
         
+        # One handshake and login per pooled connection instead of per recipient
+        self._smtp_pool = SMTPConnectionPool(
+            self.smtp_server, self.smtp_port, self.smtp_username, self.smtp_password
+        )
+        
         if not self.email_enabled:
-            print("⚠️ Email service disabled - SMTP credentials not configured")
+            logger.warning("⚠️ Email service disabled - SMTP credentials not configured")
         else:
-            print("✅ Email service initialized")
+            logger.info("✅ Email service initialized")
     
     def test_connection(self) -> bool:
         """Test SMTP connection"""
@@ -35,16 +99,16 @@ class EmailService:
             server.starttls()
             server.login(self.smtp_username, self.smtp_password)
             server.quit()
-            print("✅ Email connection test successful")
+            logger.info("✅ Email connection test successful")
             return True
         except Exception as e:
-            print(f"❌ Email connection test failed: {e}")
+            logger.error("❌ Email connection test failed: %s", e)
             return False
     
     def send_meeting_confirmation(self, meeting_data: dict, participants: List[str]) -> bool:
         """Send meeting confirmation email to all participants"""
         if not self.email_enabled:
-            print("⚠️ Email service disabled - skipping email send")
+            logger.warning("⚠️ Email service disabled - skipping email send")
             return False
         
         try:
@@ -57,33 +121,41 @@ class EmailService:
             meeting_title = meeting_data.get('title', 'Team Meeting')
             meeting_description = meeting_data.get('description', 'No description provided')
             
+            # Bodies are rendered once per meeting and shared by every recipient
+            generated_on = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            
             # Create HTML email body
             html_body = self._create_meeting_confirmation_html(
                 meeting_title, meeting_date, meeting_time, 
-                meeting_description, participants
+                meeting_description, participants, generated_on
             )
             
             # Create plain text body
             text_body = self._create_meeting_confirmation_text(
                 meeting_title, meeting_date, meeting_time, 
-                meeting_description, participants
+                meeting_description, participants, generated_on
             )
             
-            # Send to each participant
+            # Send to each participant, spread over parallel SMTP sessions
             success_count = 0
-            for participant_email in participants:
-                if self._send_email(participant_email, subject, text_body, html_body):
+            results = self._send_to_all(participants, subject, text_body, html_body)
+            for participant_email, sent in zip(participants, results):
+                if sent:
                     success_count += 1
-                    print(f"✅ Confirmation email sent to {participant_email}")
+                    logger.debug("✅ Confirmation email sent to %s", participant_email)
                 else:
-                    print(f"❌ Failed to send email to {participant_email}")
+                    logger.error("❌ Failed to send email to %s", participant_email)
             
             return success_count > 0
             
         except Exception as e:
-            print(f"❌ Error sending meeting confirmation: {e}")
+            logger.error("❌ Error sending meeting confirmation: %s", e)
             return False
     
+    def send_meeting_confirmation_async(self, meeting_data: dict, participants: List[str]) -> Future:
+        """Queue meeting confirmation emails on the background sender"""
+        return get_email_executor().submit(self.send_meeting_confirmation, meeting_data, participants)
+    
     def send_meeting_reminder(self, meeting_data: dict, participants: List[str]) -> bool:
         """Send meeting reminder email"""
         if not self.email_enabled:
@@ -95,58 +167,93 @@ class EmailService:
             meeting_date = meeting_data.get('date', 'TBD')
             meeting_time = meeting_data.get('time', 'TBD')
             meeting_title = meeting_data.get('title', 'Team Meeting')
+            generated_on = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
             html_body = self._create_meeting_reminder_html(
-                meeting_title, meeting_date, meeting_time, participants
+                meeting_title, meeting_date, meeting_time, participants, generated_on
             )
             
             text_body = self._create_meeting_reminder_text(
-                meeting_title, meeting_date, meeting_time, participants
+                meeting_title, meeting_date, meeting_time, participants, generated_on
             )
             
-            success_count = 0
-            for participant_email in participants:
-                if self._send_email(participant_email, subject, text_body, html_body):
-                    success_count += 1
+            results = self._send_to_all(participants, subject, text_body, html_body)
+            success_count = sum(results)
             
             return success_count > 0
             
         except Exception as e:
-            print(f"❌ Error sending meeting reminder: {e}")
+            logger.error("❌ Error sending meeting reminder: %s", e)
             return False
     
-    def _send_email(self, to_email: str, subject: str, text_body: str, html_body: str) -> bool:
-        """Send a single email"""
+    def _send_to_all(self, recipients: List[str], subject: str, text_body: str, html_body: str) -> List[bool]:
+        """Send one email per recipient, overlapping the sends across pooled SMTP sessions"""
+        if not recipients:
+            return []
+        
+        # Serialize the message once; only the To header differs per recipient
+        message = self._build_message(subject, text_body, html_body)
+        
+        # Each worker sends an interleaved share of the recipients over one session
+        workers = min(SMTP_PARALLEL_SESSIONS, len(recipients))
+        shares = [range(i, len(recipients), workers) for i in range(workers)]
+        
+        def send_share(indexes):
+            with self._smtp_pool.session() as server:
+                return [
+                    (i, self._send_email(recipients[i], subject, text_body, html_body, server, message))
+                    for i in indexes
+                ]
+        
+        if workers == 1:
+            share_results = [send_share(shares[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                share_results = list(executor.map(send_share, shares))
+        
+        results = [False] * len(recipients)
+        for share in share_results:
+            for i, sent in share:
+                results[i] = sent
+        return results
+    
+    def _build_message(self, subject: str, text_body: str, html_body: str) -> bytes:
+        """Serialize a text/HTML alternative email without its To header"""
+        msg = EmailMessage(policy=policy.SMTP)
+        msg['Subject'] = subject
+        msg['From'] = self.smtp_username
+        msg.set_content(text_body)
+        msg.add_alternative(html_body, subtype='html')
+        return msg.as_bytes()
+    
+    def _send_email(self, to_email: str, subject: str, text_body: str, html_body: str,
+                    server: Optional[smtplib.SMTP] = None, message: bytes = None) -> bool:
+        """Send a single email, over the given SMTP session and with a prebuilt message if passed"""
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = self.smtp_username
-            msg['To'] = to_email
-            
-            # Attach both text and HTML versions
-            text_part = MIMEText(text_body, 'plain')
-            html_part = MIMEText(html_body, 'html')
+            if message is None:
+                message = self._build_message(subject, text_body, html_body)
             
-            msg.attach(text_part)
-            msg.attach(html_part)
+            # Prepend the recipient's header to the shared serialized message
+            data = policy.SMTP.fold_binary('To', to_email) + message
             
             # Send email
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.smtp_username, self.smtp_password)
-            server.send_message(msg)
-            server.quit()
+            if server is None:
+                with self._smtp_pool.session() as server:
+                    server.sendmail(self.smtp_username, [to_email], data)
+            else:
+                server.sendmail(self.smtp_username, [to_email], data)
             
             return True
             
         except Exception as e:
-            print(f"❌ Error sending email to {to_email}: {e}")
+            logger.error("❌ Error sending email to %s: %s", to_email, e)
             return False
     
     def _create_meeting_confirmation_html(self, title: str, date: str, time: str, 
-                                        description: str, participants: List[str]) -> str:
+                                        description: str, participants: List[str],
+                                        generated_on: str = None) -> str:
         """Create HTML email body for meeting confirmation"""
+        generated_on = generated_on or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         return f"""
         <!DOCTYPE html>
         <html>
@@ -180,7 +287,7 @@ class EmailService:
                 </div>
                 <div class="footer">
                     <p>This email was sent by the Meeting Scheduler AI Assistant</p>
-                    <p>Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+                    <p>Generated on {generated_on}</p>
                 </div>
             </div>
         </body>
@@ -188,8 +295,10 @@ class EmailService:
         """
     
     def _create_meeting_confirmation_text(self, title: str, date: str, time: str, 
-                                        description: str, participants: List[str]) -> str:
+                                        description: str, participants: List[str],
+                                        generated_on: str = None) -> str:
         """Create plain text email body for meeting confirmation"""
+        generated_on = generated_on or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         return f"""
 Meeting Confirmation
 
@@ -205,12 +314,13 @@ If you need to make any changes, please contact the meeting organizer.
 
 ---
 Generated by Meeting Scheduler AI Assistant
-{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+{generated_on}
         """
     
     def _create_meeting_reminder_html(self, title: str, date: str, time: str, 
-                                     participants: List[str]) -> str:
+                                     participants: List[str], generated_on: str = None) -> str:
         """Create HTML email body for meeting reminder"""
+        generated_on = generated_on or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         return f"""
         <!DOCTYPE html>
         <html>
@@ -242,7 +352,7 @@ Generated by Meeting Scheduler AI Assistant
                 </div>
                 <div class="footer">
                     <p>This email was sent by the Meeting Scheduler AI Assistant</p>
-                    <p>Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+                    <p>Generated on {generated_on}</p>
                 </div>
             </div>
         </body>
@@ -250,8 +360,9 @@ Generated by Meeting Scheduler AI Assistant
         """
     
     def _create_meeting_reminder_text(self, title: str, date: str, time: str, 
-                                     participants: List[str]) -> str:
+                                     participants: List[str], generated_on: str = None) -> str:
         """Create plain text email body for meeting reminder"""
+        generated_on = generated_on or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         return f"""
 Meeting Reminder
 
@@ -264,9 +375,19 @@ This is a reminder for your upcoming meeting. Please be prepared and join on tim
 
 ---
 Generated by Meeting Scheduler AI Assistant
-{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+{generated_on}
         """
 
+# Background sender so SMTP latency stays off the request path
+email_executor = None
+
+def get_email_executor() -> ThreadPoolExecutor:
+    """Get the background email sender"""
+    global email_executor
+    if email_executor is None:
+        email_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="email")
+    return email_executor
+
 # Global email service instance
 email_service = None
 
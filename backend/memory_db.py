@@ -1,16 +1,42 @@
-from datetime import datetime
-from typing import List, Optional, Dict, Any
-import uuid
+import logging
+import os
+import threading
+import bisect
+import sys
+from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+import time
+from collections import defaultdict
 from models import User, Message, Meeting, MeetingIntent
 
+logger = logging.getLogger(__name__)
+
+def _to_dict(row) -> Dict[str, Any]:
+    """Plain dict copy of a stored row for callers"""
+    return {name: getattr(row, name) for name in row.__slots__}
+
+def _new_id() -> str:
+    """Opaque random 128-bit id, without uuid4's object construction and formatting"""
+    return os.urandom(16).hex()
+
 class MemoryDatabaseManager:
     """Simple in-memory database for testing when MongoDB is not available"""
     
     def __init__(self):
+        # Rows are slotted model dataclasses; callers get dict copies
         self.users = {}
+        self.users_by_email = {}  # email -> id of the first user created with it
         self.messages = []
+        self._timestamps = []  # parallel to self.messages, for bisecting by time
+        self.messages_by_email = defaultdict(list)
+        # Guards the three message lists above, which must change together
+        self._messages_lock = threading.Lock()
         self.meetings = {}
-        print("✅ Memory database initialized for testing")
+        # Canonical participant tuples, so meetings with the same attendees share one
+        self._participants_interner = {}
+        self.messages_version = 0
+        self._meeting_contexts_cache = None
+        logger.info("✅ Memory database initialized for testing")
     
     def test_connection(self) -> bool:
         """Test database connection"""
@@ -24,168 +50,249 @@ class MemoryDatabaseManager:
     def create_user(self, name: str, email: str) -> Optional[str]:
         """Create a new user"""
         try:
-            user_id = str(uuid.uuid4())
-            user_data = {
-                "id": user_id,
-                "name": name,
-                "email": email,
-                "created_at": datetime.now()
-            }
-            self.users[user_id] = user_data
+            user_id = _new_id()
+            self.users[user_id] = User(id=user_id, name=name, email=email, created_at=datetime.now())
+            self.users_by_email.setdefault(email, user_id)
             return user_id
         except Exception as e:
-            print(f"❌ Error creating user: {e}")
+            logger.error("❌ Error creating user: %s", e)
             return None
     
-    def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
-        """Get user by email"""
+    def create_users_bulk(self, users: List[Dict[str, Any]]) -> List[str]:
+        """Create several users, skipping emails that already exist"""
         try:
-            for user in self.users.values():
-                if user["email"] == email:
-                    return user
-            return None
+            now = datetime.now()
+            user_ids = []
+            for user in users:
+                if user["email"] in self.users_by_email:
+                    continue
+                user_id = _new_id()
+                self.users[user_id] = User(id=user_id, name=user["name"], email=user["email"], created_at=now)
+                self.users_by_email[user["email"]] = user_id
+                user_ids.append(user_id)
+            return user_ids
         except Exception as e:
-            print(f"❌ Error getting user: {e}")
-            return None
+            logger.error("❌ Error creating users: %s", e)
+            return []
+    
+    def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """Get user by email"""
+        user_id = self.users_by_email.get(email)
+        return _to_dict(self.users[user_id]) if user_id else None
     
     def get_all_users(self) -> List[Dict[str, Any]]:
         """Get all users"""
-        try:
-            return list(self.users.values())
-        except Exception as e:
-            print(f"❌ Error getting users: {e}")
-            return []
+        return [_to_dict(user) for user in self.users.values()]
     
     # Message operations
-    def save_message(self, name: str, email: str, message: str) -> Optional[str]:
+    def save_message(self, name: str, email: str, message: str,
+                     timestamp: datetime = None) -> Optional[str]:
         """Save a new message and auto-create user if they don't exist"""
         try:
-            # First, check if user exists
-            user_exists = any(user["email"] == email for user in self.users.values())
+            timestamp = timestamp or datetime.now()
             
             # If user doesn't exist, create them
-            if not user_exists:
-                user_id = str(uuid.uuid4())
-                user_data = {
-                    "id": user_id,
-                    "name": name,
-                    "email": email,
-                    "created_at": datetime.now()
-                }
-                self.users[user_id] = user_data
-                print(f"✅ Auto-created user: {name} ({email})")
+            if email not in self.users_by_email:
+                user_id = _new_id()
+                self.users[user_id] = User(id=user_id, name=name, email=email, created_at=timestamp)
+                self.users_by_email[email] = user_id
+                logger.info("✅ Auto-created user: %s (%s)", name, email)
             
             # Save the message
-            message_id = str(uuid.uuid4())
-            message_data = {
-                "id": message_id,
-                "name": name,
-                "email": email,
-                "message": message,
-                "timestamp": datetime.now()
-            }
-            self.messages.append(message_data)
+            message_id = _new_id()
+            message_data = Message(id=message_id, name=name, email=email, message=message, timestamp=timestamp)
+            with self._messages_lock:
+                user_messages = self.messages_by_email[email]
+                if not self._timestamps or timestamp >= self._timestamps[-1]:
+                    self.messages.append(message_data)
+                    self._timestamps.append(timestamp)
+                    user_messages.append(message_data)
+                else:
+                    # An explicit older timestamp goes into place to keep every list sorted
+                    i = bisect.bisect_right(self._timestamps, timestamp)
+                    self.messages.insert(i, message_data)
+                    self._timestamps.insert(i, timestamp)
+                    j = bisect.bisect_right(user_messages, timestamp, key=lambda row: row.timestamp)
+                    user_messages.insert(j, message_data)
+                self.messages_version += 1
             return message_id
         except Exception as e:
-            print(f"❌ Error saving message: {e}")
+            logger.error("❌ Error saving message: %s", e)
             return None
     
-    def get_messages(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get messages with limit"""
+    def save_messages_bulk(self, messages: List[Dict[str, Any]],
+                           skip_user_check: bool = False) -> List[str]:
+        """Save several messages at once, auto-creating missing users
+        unless the caller already registered every sender"""
+        if not messages:
+            return []
         try:
-            sorted_messages = sorted(self.messages, key=lambda x: x["timestamp"], reverse=True)
-            return sorted_messages[:limit]
+            if not skip_user_check:
+                created = self.create_users_bulk(messages)
+                if created:
+                    logger.info("✅ Auto-created %s users", len(created))
+            
+            with self._messages_lock:
+                # Read the clock once; a microsecond step per message keeps them ordered,
+                # starting no earlier than the newest stored message
+                now = datetime.now()
+                if self._timestamps:
+                    now = max(now, self._timestamps[-1])
+                message_rows = [
+                    Message(
+                        id=_new_id(),
+                        name=msg["name"],
+                        email=msg["email"],
+                        message=msg["message"],
+                        timestamp=now + timedelta(microseconds=i)
+                    )
+                    for i, msg in enumerate(messages)
+                ]
+                # One extend grows the list once instead of once per append
+                self.messages.extend(message_rows)
+                self._timestamps.extend(row.timestamp for row in message_rows)
+                for row in message_rows:
+                    self.messages_by_email[row.email].append(row)
+                self.messages_version += 1
+            return [row.id for row in message_rows]
         except Exception as e:
-            print(f"❌ Error getting messages: {e}")
+            logger.error("❌ Error saving messages: %s", e)
             return []
     
+    def get_messages(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get messages with limit"""
+        # Messages are appended as they arrive, so the newest are at the end
+        if limit <= 0:
+            return [_to_dict(msg) for msg in self.messages[::-1][:limit]]
+        return [_to_dict(msg) for msg in self.messages[:-limit - 1:-1]]
+    
+    def get_messages_since(self, since: datetime, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get up to `limit` messages sent at or after `since`, oldest first"""
+        with self._messages_lock:
+            i = bisect.bisect_left(self._timestamps, since)
+            rows = self.messages[i:i + limit]
+        return [_to_dict(msg) for msg in rows]
+    
+    def iter_messages(self, limit: int = 100) -> Iterator[Dict[str, Any]]:
+        """Yield messages with limit"""
+        yield from self.get_messages(limit)
+    
     def get_messages_by_user(self, email: str) -> List[Dict[str, Any]]:
         """Get messages by user email"""
-        try:
-            user_messages = [msg for msg in self.messages if msg["email"] == email]
-            return sorted(user_messages, key=lambda x: x["timestamp"], reverse=True)
-        except Exception as e:
-            print(f"❌ Error getting user messages: {e}")
-            return []
+        # Messages are appended as they arrive, so each user's list is oldest first
+        user_messages = self.messages_by_email.get(email, [])
+        return [_to_dict(msg) for msg in reversed(user_messages)]
     
     # Meeting operations
     def create_meeting(self, date: str, time: str, participants: List[str], 
                       title: str = None, description: str = None) -> Optional[str]:
         """Create a new meeting"""
         try:
-            meeting_id = str(uuid.uuid4())
-            meeting_data = {
-                "id": meeting_id,
-                "title": title or f"Meeting on {date}",
-                "date": date,
-                "time": time,
-                "participants": participants,
-                "description": description or "Meeting scheduled via AI assistant",
-                "status": "scheduled",
-                "created_at": datetime.now()
-            }
-            self.meetings[meeting_id] = meeting_data
+            meeting_id = _new_id()
+            self.meetings[meeting_id] = Meeting(
+                id=meeting_id,
+                title=title or f"Meeting on {date}",
+                date=date,
+                time=time,
+                participants=self._intern_participants(participants),
+                description=description or "Meeting scheduled via AI assistant",
+                status="scheduled",
+                created_at=datetime.now()
+            )
             return meeting_id
         except Exception as e:
-            print(f"❌ Error creating meeting: {e}")
+            logger.error("❌ Error creating meeting: %s", e)
             return None
     
+    def _intern_participants(self, participants: List[str]) -> Tuple[str, ...]:
+        """Shared immutable tuple for a participant list, with interned emails"""
+        key = tuple(map(sys.intern, participants))
+        return self._participants_interner.setdefault(key, key)
+    
+    def create_meetings(self, meetings: List[Dict[str, Any]]) -> List[str]:
+        """Create several meetings"""
+        meeting_ids = []
+        for meeting in meetings:
+            meeting_id = self.create_meeting(
+                date=meeting["date"],
+                time=meeting["time"],
+                participants=meeting["participants"],
+                title=meeting.get("title"),
+                description=meeting.get("description")
+            )
+            if meeting_id:
+                meeting_ids.append(meeting_id)
+        return meeting_ids
+    
     def get_meetings(self) -> List[Dict[str, Any]]:
         """Get all meetings"""
-        try:
-            return list(self.meetings.values())
-        except Exception as e:
-            print(f"❌ Error getting meetings: {e}")
-            return []
+        return [_to_dict(meeting) for meeting in self.meetings.values()]
     
     def get_meeting_by_id(self, meeting_id: str) -> Optional[Dict[str, Any]]:
         """Get meeting by ID"""
-        try:
-            return self.meetings.get(meeting_id)
-        except Exception as e:
-            print(f"❌ Error getting meeting: {e}")
-            return None
+        meeting = self.meetings.get(meeting_id)
+        return _to_dict(meeting) if meeting else None
     
     def update_meeting_status(self, meeting_id: str, status: str) -> bool:
         """Update meeting status"""
-        try:
-            if meeting_id in self.meetings:
-                self.meetings[meeting_id]["status"] = status
-                return True
-            return False
-        except Exception as e:
-            print(f"❌ Error updating meeting status: {e}")
-            return False
+        if meeting_id in self.meetings:
+            self.meetings[meeting_id].status = status
+            return True
+        return False
+    
+    # Meeting context cache
+    def get_messages_version(self) -> int:
+        """Get the counter that changes whenever messages are added"""
+        return self.messages_version
+    
+    def get_cached_meeting_contexts(self) -> Optional[Dict[str, Any]]:
+        """Get the cached meeting contexts with the messages version they were built from"""
+        return self._meeting_contexts_cache
+    
+    def save_meeting_contexts(self, version: int, contexts: List[Dict[str, Any]]) -> bool:
+        """Store meeting contexts computed for the given messages version"""
+        self._meeting_contexts_cache = {
+            "version": version,
+            "contexts": contexts,
+            "built_at": time.time()
+        }
+        return True
     
     def get_chat_statistics(self) -> Dict[str, Any]:
         """Get chat statistics"""
-        try:
-            total_users = len(self.users)
-            total_messages = len(self.messages)
-            total_meetings = len(self.meetings)
-            unique_participants = len(set(msg["email"] for msg in self.messages))
-            
-            return {
-                "total_users": total_users,
-                "total_messages": total_messages,
-                "total_meetings": total_meetings,
-                "unique_participants": unique_participants,
-                "last_message": self.messages[-1]["timestamp"] if self.messages else None
-            }
-        except Exception as e:
-            print(f"❌ Error getting statistics: {e}")
-            return {
-                "total_users": 0,
-                "total_messages": 0,
-                "total_meetings": 0,
-                "unique_participants": 0,
-                "last_message": None
-            }
+        total_users = len(self.users)
+        total_messages = len(self.messages)
+        total_meetings = len(self.meetings)
+        # Every sender has an entry in the per-email message index
+        unique_participants = len(self.messages_by_email)
+        
+        return {
+            "total_users": total_users,
+            "total_messages": total_messages,
+            "total_meetings": total_meetings,
+            "unique_participants": unique_participants,
+            "last_message": self.messages[-1].timestamp if self.messages else None
+        }
     
     def close_connection(self):
         """No-op for memory database"""
         pass
 
+# Global memory database instance, shared so every caller sees the same data
+memory_db_manager = None
+_memory_db_lock = threading.Lock()
+
 def get_memory_db_manager() -> MemoryDatabaseManager:
     """Get memory database manager instance"""
-    return MemoryDatabaseManager() 
\ No newline at end of file
+    global memory_db_manager
+    if memory_db_manager is None:
+        with _memory_db_lock:
+            if memory_db_manager is None:
+                memory_db_manager = MemoryDatabaseManager()
+    return memory_db_manager
+
+def reset_memory_db():
+    """Discard the shared memory database so the next call starts empty"""
+    global memory_db_manager
+    with _memory_db_lock:
+        memory_db_manager = None 
\ No newline at end of file
@@ -1,9 +1,10 @@
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from pydantic import BaseModel, EmailStr
-from bson import ObjectId
 
-# Pydantic models for API requests/responses
+# Pydantic models validate API requests; stored records and responses are
+# slotted dataclasses, which skip per-field validation and per-instance __dict__
 class UserBase(BaseModel):
     name: str
     email: str
@@ -11,12 +12,12 @@ class UserBase(BaseModel):
 class UserCreate(UserBase):
     pass
 
-class User(UserBase):
+@dataclass(slots=True, kw_only=True)
+class User:
+    name: str
+    email: str
     id: str
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
 
 class MessageBase(BaseModel):
     name: str
@@ -26,12 +27,13 @@ class MessageBase(BaseModel):
 class MessageCreate(MessageBase):
     pass
 
-class Message(MessageBase):
+@dataclass(slots=True, kw_only=True)
+class Message:
+    name: str
+    email: str
+    message: str
     id: str
     timestamp: datetime
-    
-    class Config:
-        from_attributes = True
 
 class MeetingBase(BaseModel):
     date: str
@@ -43,25 +45,32 @@ class MeetingBase(BaseModel):
 class MeetingCreate(MeetingBase):
     pass
 
-class Meeting(MeetingBase):
+@dataclass(slots=True, kw_only=True)
+class Meeting:
+    date: str
+    time: str
+    participants: Tuple[str, ...]  # immutable; the memory store shares one tuple across meetings
     id: str
     created_at: datetime
+    title: Optional[str] = None
+    description: Optional[str] = None
     status: str = "scheduled"  # scheduled, cancelled, completed
-    
-    class Config:
-        from_attributes = True
 
-class MeetingIntent(BaseModel):
+# Internal NLP result, built and mutated per meeting context; a slotted dataclass
+# avoids per-instance __dict__ and pydantic validation
+@dataclass(slots=True)
+class MeetingIntent:
     intent_detected: bool
     confidence: float
-    extracted_dates: List[str] = []
-    extracted_times: List[str] = []
-    participants: List[str] = []
+    extracted_dates: List[str] = field(default_factory=list)
+    extracted_times: List[str] = field(default_factory=list)
+    participants: List[str] = field(default_factory=list)
     suggested_date: Optional[str] = None
     suggested_time: Optional[str] = None
-    missing_info: List[str] = []
+    missing_info: List[str] = field(default_factory=list)
 
-class EmailNotification(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class EmailNotification:
     to_emails: List[str]
     subject: str
     body: str
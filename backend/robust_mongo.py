@@ -1,86 +1,105 @@
 import os
+import logging
 from dotenv import load_dotenv
 from pymongo import MongoClient
-from pymongo.errors import ServerSelectionTimeoutError, ConnectionFailure
-import ssl
+from pymongo.errors import ConnectionFailure
+import functools
+import threading
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
-def create_mongo_client():
-    """Create MongoDB client with multiple fallback options"""
-    
-    mongo_uri = os.getenv("MONGO_URI")
-    if not mongo_uri:
-        raise ValueError("MONGO_URI not found in environment variables")
-    
-    # Method 1: Try with minimal SSL settings
-    try:
-        print("🔍 Trying Method 1: Minimal SSL settings...")
-        client = MongoClient(
-            mongo_uri,
+# Pool settings shared by every connection method, so the returned client
+# keeps warm sockets for later operations instead of handshaking again
+POOL_OPTIONS = dict(
+    maxPoolSize=50,
+    minPoolSize=5,
+    maxIdleTimeMS=60000,
+    waitQueueTimeoutMS=5000,
+    retryWrites=True
+)
+
+def _without_srv(mongo_uri):
+    """The URI with a mongodb+srv:// scheme swapped for mongodb://"""
+    if mongo_uri.startswith('mongodb+srv://'):
+        return 'mongodb://' + mongo_uri[len('mongodb+srv://'):]
+    return mongo_uri
+
+def _connection_methods(mongo_uri):
+    """Connection attempts in order of preference: (label, uri, client options)"""
+    return [
+        ("Minimal SSL settings", mongo_uri, dict(
             serverSelectionTimeoutMS=10000,
             connectTimeoutMS=10000,
             socketTimeoutMS=10000
-        )
-        client.admin.command('ping')
-        print("✅ Method 1 successful!")
-        return client
-    except Exception as e:
-        print(f"❌ Method 1 failed: {e}")
-    
-    # Method 2: Try with explicit SSL settings
-    try:
-        print("🔍 Trying Method 2: Explicit SSL settings...")
-        client = MongoClient(
-            mongo_uri,
+        )),
+        ("Explicit SSL settings", mongo_uri, dict(
             serverSelectionTimeoutMS=15000,
             connectTimeoutMS=15000,
             socketTimeoutMS=15000,
-            ssl=True,
+            tls=True,
             tlsAllowInvalidCertificates=True,
             tlsAllowInvalidHostnames=True
-        )
-        client.admin.command('ping')
-        print("✅ Method 2 successful!")
-        return client
-    except Exception as e:
-        print(f"❌ Method 2 failed: {e}")
-    
-    # Method 3: Try with insecure TLS
-    try:
-        print("🔍 Trying Method 3: Insecure TLS...")
-        client = MongoClient(
-            mongo_uri,
+        )),
+        ("Insecure TLS", mongo_uri, dict(
             serverSelectionTimeoutMS=20000,
             connectTimeoutMS=20000,
             socketTimeoutMS=20000,
-            ssl=True,
-            tlsAllowInvalidCertificates=True,
-            tlsAllowInvalidHostnames=True,
+            # tlsInsecure implies the other relaxations and can't be combined with them
+            tls=True,
             tlsInsecure=True
-        )
-        client.admin.command('ping')
-        print("✅ Method 3 successful!")
-        return client
-    except Exception as e:
-        print(f"❌ Method 3 failed: {e}")
-    
-    # Method 4: Try without SSL (if URI allows)
-    try:
-        print("🔍 Trying Method 4: Without SSL...")
-        uri_without_ssl = mongo_uri.replace('mongodb+srv://', 'mongodb://')
-        client = MongoClient(
-            uri_without_ssl,
+        )),
+        # Without SSL (if URI allows)
+        ("Without SSL", _without_srv(mongo_uri), dict(
             serverSelectionTimeoutMS=10000,
             connectTimeoutMS=10000,
             socketTimeoutMS=10000
-        )
+        ))
+    ]
+
+def _try_method(number, label, uri, options):
+    """Connect with one method and ping; raises if the server can't be reached"""
+    logger.info("🔍 Trying Method %s: %s...", number, label)
+    client = MongoClient(uri, **options, **POOL_OPTIONS)
+    try:
         client.admin.command('ping')
-        print("✅ Method 4 successful!")
-        return client
+    except Exception:
+        client.close()
+        raise
+    return client
+
+def _warm_up(client):
+    """Ping the application database so its pool has connections ready"""
+    try:
+        client["meeting_scheduler"].command('ping')
     except Exception as e:
-        print(f"❌ Method 4 failed: {e}")
+        logger.warning("⚠️ Connection warm-up failed: %s", e)
+
+@functools.lru_cache(maxsize=1)
+def create_mongo_client():
+    """Create MongoDB client with multiple fallback options; the client is shared by later calls"""
+    
+    mongo_uri = os.getenv("MONGO_URI")
+    if not mongo_uri:
+        raise ValueError("MONGO_URI not found in environment variables")
+    
+    # Methods run one at a time, so the insecure fallbacks are only tried
+    # once every more secure method has failed
+    for number, (label, uri, options) in enumerate(_connection_methods(mongo_uri), start=1):
+        try:
+            client = _try_method(number, label, uri, options)
+        except Exception as e:
+            logger.warning("❌ Method %s failed: %s", number, e)
+            continue
+        logger.info("✅ Method %s successful!", number)
+        
+        # Open the application database's first sockets off the caller's thread
+        threading.Thread(
+            target=_warm_up, args=(client,), name="mongo-warmup", daemon=True
+        ).start()
+        return client
     
     # If all methods fail
     raise ConnectionFailure("All MongoDB connection methods failed")
@@ -100,6 +119,7 @@ def test_robust_connection():
         print(f"📊 Available collections: {collections}")
         
         client.close()
+        create_mongo_client.cache_clear()
         return True
         
     except Exception as e:
@@ -113,4 +133,5 @@ def test_robust_connection():
         return False
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     test_robust_connection() 
\ No newline at end of file
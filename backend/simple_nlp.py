@@ -1,33 +1,337 @@
 import re
-import dateparser
-from datetime import datetime, timedelta
+import functools
+from dataclasses import replace
+from datetime import date, datetime, timedelta
 from typing import List, Dict, Any, Optional
 from models import MeetingIntent
 
-def analyze_meeting_intent(message: str) -> MeetingIntent:
+# Date expressions resolved without dateparser; results match dateparser.parse
+_RELATIVE_DAY_OFFSETS = {
+    'today': 0, 'tomorrow': 1, 'yesterday': -1,
+    'this week': 0, 'next week': 7, 'last week': -7
+}
+_WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+_IN_DAYS_PATTERN = re.compile(r'in (\d+) (day|week)s?')
+
+# Keyword lists and regexes used by analyze_meeting_intent, compiled once at import
+_REGEX_METACHARS = re.compile(r'[\\.^$*+?{}\[\]|()]')
+_DIGIT_PATTERN = re.compile(r'\d')
+
+def _trie_regex(words) -> str:
+    """Alternation of literal words with shared prefixes factored out, e.g. to(?:day|morrow)"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def build(node) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        regex = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            regex = ('(?:' + regex + ')' if len(branches) == 1 else regex) + '?'
+        return regex
+    
+    return build(trie)
+
+def _compile_patterns(patterns):
     """
-    Simplified meeting intent detection using regex and dateparser
+    Split a pattern list into (patterns, literal scanner): plain keywords stay strings
+    and are all found by the scanner in one pass, the rest are compiled
     """
-    message_lower = message.lower()
+    patterns = tuple(p if not _REGEX_METACHARS.search(p) else re.compile(p) for p in patterns)
+    literals = [p for p in patterns if isinstance(p, str)]
+    # A lookahead reports every start position, so keywords inside longer ones
+    # ("morning" in "this morning") are still found, as separate findall calls would
+    return patterns, re.compile('(?=(' + _trie_regex(literals) + '))')
+
+def _find_patterns(patterns, scanner, text: str) -> List[Any]:
+    """re.findall of every pattern in turn, concatenated, with one scan for all keywords"""
+    counts = {}
+    ends = {}
+    for match in scanner.finditer(text):
+        keyword = match.group(1)
+        # findall doesn't count overlapping occurrences of the same keyword
+        if match.start() >= ends.get(keyword, 0):
+            counts[keyword] = counts.get(keyword, 0) + 1
+            ends[keyword] = match.end(1)
     
-    # Check for meeting-related keywords (more flexible)
-    meeting_keywords = [
-        'meeting', 'schedule', 'appointment', 'call', 'discussion',
-        'sync', 'catch up', 'get together', 'meet up', 'meet',
-        'book', 'arrange', 'set up', 'organize', 'plan',
-        'conference', 'video call', 'zoom', 'teams', 'google meet',
-        'hangout', 'coffee', 'lunch', 'dinner', 'breakfast',
-        'standup', 'stand up', 'daily', 'weekly', 'monthly',
-        'review', 'brainstorm', 'workshop', 'training', 'presentation'
-    ]
+    # Every non-keyword pattern needs a digit, so most messages skip them all
+    has_digit = _DIGIT_PATTERN.search(text) is not None
+    results = []
+    for pattern in patterns:
+        if isinstance(pattern, str):
+            results.extend([pattern] * counts.get(pattern, 0))
+        elif has_digit:
+            results.extend(pattern.findall(text))
+    return results
+
+# Meeting-related keywords (more flexible)
+_MEETING_KEYWORDS = (
+    'meeting', 'schedule', 'appointment', 'call', 'discussion',
+    'sync', 'catch up', 'get together', 'meet up', 'meet',
+    'book', 'arrange', 'set up', 'organize', 'plan',
+    'conference', 'video call', 'zoom', 'teams', 'google meet',
+    'hangout', 'coffee', 'lunch', 'dinner', 'breakfast',
+    'standup', 'stand up', 'daily', 'weekly', 'monthly',
+    'review', 'brainstorm', 'workshop', 'training', 'presentation'
+)
+
+# Time-related words that suggest scheduling
+_TIME_WORDS = ('when', 'what time', 'available', 'free', 'busy', 'can', 'could')
+
+# Either kind of word anywhere in the message (substring match, like `in`) means intent
+_INTENT_PATTERN = re.compile(_trie_regex(_MEETING_KEYWORDS + _TIME_WORDS))
+
+# Date patterns (more flexible patterns)
+_DATE_PATTERNS, _DATE_KEYWORDS = _compile_patterns((
+    # Relative dates
+    r'tomorrow',
+    r'today',
+    r'yesterday',
+    r'next week',
+    r'this week',
+    r'last week',
+    r'next month',
+    r'this month',
+    r'next year',
+    r'this year',
+    
+    # Days of week
+    r'next monday', r'next tuesday', r'next wednesday', r'next thursday', 
+    r'next friday', r'next saturday', r'next sunday',
+    r'this monday', r'this tuesday', r'this wednesday', r'this thursday',
+    r'this friday', r'this saturday', r'this sunday',
+    r'monday', r'tuesday', r'wednesday', r'thursday', r'friday', r'saturday', r'sunday',
+    
+    # Specific dates
+    r'\d{1,2}/\d{1,2}/\d{4}',
+    r'\d{1,2}-\d{1,2}-\d{4}',
+    r'\d{1,2}\.\d{1,2}\.\d{4}',
+    r'\d{1,2}/\d{1,2}',
+    r'\d{1,2}-\d{1,2}',
+    
+    # Month names
+    r'january \d{1,2}', r'february \d{1,2}', r'march \d{1,2}', r'april \d{1,2}',
+    r'may \d{1,2}', r'june \d{1,2}', r'july \d{1,2}', r'august \d{1,2}',
+    r'september \d{1,2}', r'october \d{1,2}', r'november \d{1,2}', r'december \d{1,2}',
+    
+    # Flexible date expressions
+    r'in \d+ days?',
+    r'in \d+ weeks?',
+    r'in \d+ months?',
+    r'\d+ days? from now',
+    r'\d+ weeks? from now',
+    r'\d+ months? from now'
+))
+
+# Time patterns (more flexible patterns for natural language)
+_TIME_PATTERNS, _TIME_KEYWORDS = _compile_patterns((
+    # Specific times with various formats
+    r'\d{1,2}:\d{2}\s*(am|pm)',
+    r'\d{1,2}\s*(am|pm)',
+    r'\d{1,2}:\d{2}',
+    r'\d{1,2}:\d{2}\s*(am|pm)',
+    
+    # Natural time expressions
+    r'at \d{1,2}',
+    r'around \d{1,2}',
+    r'about \d{1,2}',
+    r'\d{1,2}ish',
+    r'\d{1,2} o\'clock',
+    r'\d{1,2} o clock',
+    r'\d{1,2} pm',
+    r'\d{1,2} am',
+    r'\d{1,2} PM',
+    r'\d{1,2} AM',
+    
+    # Time periods
+    r'morning',
+    r'afternoon',
+    r'evening',
+    r'night',
+    r'noon',
+    r'midnight',
+    r'early morning',
+    r'late afternoon',
+    r'late evening',
+    
+    # Business hours
+    r'business hours',
+    r'office hours',
+    r'work hours',
+    r'9 to 5',
+    r'9-5',
+    
+    # Common natural expressions
+    r'this afternoon',
+    r'this morning',
+    r'this evening',
+    r'tomorrow morning',
+    r'tomorrow afternoon',
+    r'tomorrow evening',
+    r'next morning',
+    r'next afternoon',
+    r'next evening'
+))
+
+# Participant patterns (more flexible name extraction)
+_NAME_PATTERNS = tuple(re.compile(p) for p in (
+    # Direct mentions
+    r'with\s+([a-zA-Z]+)',
+    r'meet\s+([a-zA-Z]+)',
+    r'([a-zA-Z]+)\s+and\s+([a-zA-Z]+)',
+    r'([a-zA-Z]+),\s+([a-zA-Z]+)',
+    r'([a-zA-Z]+)\s*&\s*([a-zA-Z]+)'
+    # Team and role mentions ("team", "manager", ...) used to be matched here
+    # too, but they are all in _COMMON_WORDS and were always filtered out again
+))
+
+# Generic mentions that are not participant names
+_COMMON_WORDS = frozenset(('team', 'everyone', 'all', 'group', 'us', 'we', 'manager', 'lead', 'developer', 'designer', 'stakeholder', 'client', 'customer'))
+
+_HOUR_PATTERN = re.compile(r'(\d{1,2})')
+
+# Fallback time lookup when no time pattern matched. The lookahead reports every
+# candidate in one scan (no two kinds can start at the same position); the
+# candidate with the best priority wins, earliest first among equals
+_FALLBACK_TIME_PATTERN = re.compile(
+    r'(?=(?P<ampm>(?P<ampm_hour>\d{1,2})\s*(?P<ampm_meridiem>am|pm))'
+    r'|(?P<period>morning|afternoon|evening|noon|midnight)'
+    r'|(?P<at>at\s+(?P<at_hour>\d{1,2})(?:\s*(?P<at_meridiem>am|pm))?)'
+    r'|(?P<around>(?:around|about)\s+(?P<around_hour>\d{1,2})))'
+)
+_FALLBACK_PERIODS = {
+    # period -> (priority, label); "8am" beats a period, which beats "at 3" and "around 3"
+    'morning': (1, "9:00 AM"),
+    'afternoon': (2, "2:00 PM"),
+    'evening': (3, "6:00 PM"),
+    'noon': (4, "12:00 PM"),
+    'midnight': (5, "12:00 AM")
+}
+_FALLBACK_AT_PRIORITY = 6
+_FALLBACK_AROUND_PRIORITY = 7
+
+def _fallback_time(message_lower: str) -> Optional[str]:
+    """Best-effort time from loose patterns like '8am', 'at 3' or 'around 4'"""
+    best_priority, best_label = None, None
+    for match in _FALLBACK_TIME_PATTERN.finditer(message_lower):
+        kind = match.lastgroup
+        if kind == 'ampm':
+            # Nothing outranks an explicit am/pm hour
+            return f"{match['ampm_hour']}:00 {match['ampm_meridiem'].upper()}"
+        elif kind == 'period':
+            priority, label = _FALLBACK_PERIODS[match['period']]
+        elif kind == 'at':
+            priority = _FALLBACK_AT_PRIORITY
+            label = f"{match['at_hour']}:00 {(match['at_meridiem'] or 'pm').upper()}"
+        else:
+            priority = _FALLBACK_AROUND_PRIORITY
+            label = f"{match['around_hour']}:00 PM"
+        if best_priority is None or priority < best_priority:
+            best_priority, best_label = priority, label
+    return best_label
+
+def _hour_label(hour: int, meridiem: Optional[str]) -> str:
+    """Format an extracted hour as a 12-hour time, e.g. (3, 'pm') -> '3:00 PM'"""
+    if meridiem is None:
+        # Business context: most meetings are in the afternoon, so a bare hour is PM
+        return f"{hour}:00 PM"
+    
+    if meridiem == 'pm' and hour != 12:
+        hour += 12
+    elif meridiem == 'am' and hour == 12:
+        hour = 0
+    
+    if hour == 0:
+        return "12:00 AM"
+    elif hour < 12:
+        return f"{hour}:00 AM"
+    elif hour == 12:
+        return "12:00 PM"
+    return f"{hour-12}:00 PM"
+
+# Every label an extracted hour (one or two digits) can get, so parsing is a lookup
+_HOUR_LABELS = {
+    (hour, meridiem): _hour_label(hour, meridiem)
+    for hour in range(100)
+    for meridiem in ('am', 'pm', None)
+}
+
+# Shared English-only dateparser instance, created on first use
+_date_parser = None
+
+def _get_date_parser():
+    """Get the dateparser parser, importing dateparser only once something needs it"""
+    global _date_parser
+    if _date_parser is None:
+        # Every pattern that reaches dateparser is English, so language detection is skipped
+        from dateparser.date import DateDataParser
+        _date_parser = DateDataParser(languages=['en'])
+    return _date_parser
+
+def _parse_iso_or_relative(text: str, today: date) -> Optional[date]:
+    """Parse a date expression, importing dateparser only for uncommon forms"""
+    if text in _RELATIVE_DAY_OFFSETS:
+        return today + timedelta(days=_RELATIVE_DAY_OFFSETS[text])
+    
+    if text in _WEEKDAYS:
+        # A bare weekday means its most recent occurrence (today included)
+        return today - timedelta(days=(today.weekday() - _WEEKDAYS.index(text)) % 7)
     
-    # More flexible intent detection
-    intent_detected = any(keyword in message_lower for keyword in meeting_keywords)
+    match = _IN_DAYS_PATTERN.fullmatch(text)
+    if match:
+        amount = int(match.group(1))
+        return today + timedelta(days=amount * 7 if match.group(2) == 'week' else amount)
     
-    # Also check for time-related words that suggest scheduling
-    time_words = ['when', 'what time', 'available', 'free', 'busy', 'can', 'could']
-    if any(word in message_lower for word in time_words):
-        intent_detected = True
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        pass
+    
+    date_data = _get_date_parser().get_date_data(text)
+    return date_data['date_obj'].date() if date_data and date_data['date_obj'] else None
+
+def analyze_meeting_intent(message: str) -> MeetingIntent:
+    """
+    Simplified meeting intent detection using regex and dateparser
+    """
+    # Analysis only sees the lowercased text, so messages differing in case share an entry;
+    # relative dates ("tomorrow") resolve against today, so it is part of the cache key
+    intent = _analyze_meeting_intent_cached(message.lower(), date.today().isoformat())
+    # Hand out a copy so callers can mutate participants without touching the cache
+    return _copy_intent(intent)
+
+def analyze_meeting_intents(messages: List[str]) -> List[MeetingIntent]:
+    """
+    Analyze several messages in one call, sharing the cache key date across the batch
+    """
+    today = date.today().isoformat()
+    return [
+        _copy_intent(_analyze_meeting_intent_cached(message.lower(), today))
+        for message in messages
+    ]
+
+def _copy_intent(intent: MeetingIntent) -> MeetingIntent:
+    """Copy a cached intent, including its lists"""
+    return replace(
+        intent,
+        extracted_dates=list(intent.extracted_dates),
+        extracted_times=list(intent.extracted_times),
+        participants=list(intent.participants),
+        missing_info=list(intent.missing_info)
+    )
+
+@functools.lru_cache(maxsize=2048)
+def _analyze_meeting_intent_cached(message_lower: str, today: str) -> MeetingIntent:
+    """
+    Analyze a lowercased message for meeting intent; results are cached per message and day
+    """
+    # More flexible intent detection: meeting keywords or time-related words, in one scan
+    intent_detected = _INTENT_PATTERN.search(message_lower) is not None
     
     if not intent_detected:
         return MeetingIntent(
@@ -41,225 +345,58 @@ def analyze_meeting_intent(message: str) -> MeetingIntent:
             missing_info=[]
         )
     
-    # Extract dates (more flexible patterns)
-    date_patterns = [
-        # Relative dates
-        r'tomorrow',
-        r'today',
-        r'yesterday',
-        r'next week',
-        r'this week',
-        r'last week',
-        r'next month',
-        r'this month',
-        r'next year',
-        r'this year',
-        
-        # Days of week
-        r'next monday', r'next tuesday', r'next wednesday', r'next thursday', 
-        r'next friday', r'next saturday', r'next sunday',
-        r'this monday', r'this tuesday', r'this wednesday', r'this thursday',
-        r'this friday', r'this saturday', r'this sunday',
-        r'monday', r'tuesday', r'wednesday', r'thursday', r'friday', r'saturday', r'sunday',
-        
-        # Specific dates
-        r'\d{1,2}/\d{1,2}/\d{4}',
-        r'\d{1,2}-\d{1,2}-\d{4}',
-        r'\d{1,2}\.\d{1,2}\.\d{4}',
-        r'\d{1,2}/\d{1,2}',
-        r'\d{1,2}-\d{1,2}',
-        
-        # Month names
-        r'january \d{1,2}', r'february \d{1,2}', r'march \d{1,2}', r'april \d{1,2}',
-        r'may \d{1,2}', r'june \d{1,2}', r'july \d{1,2}', r'august \d{1,2}',
-        r'september \d{1,2}', r'october \d{1,2}', r'november \d{1,2}', r'december \d{1,2}',
-        
-        # Flexible date expressions
-        r'in \d+ days?',
-        r'in \d+ weeks?',
-        r'in \d+ months?',
-        r'\d+ days? from now',
-        r'\d+ weeks? from now',
-        r'\d+ months? from now'
-    ]
-    
     extracted_dates = []
-    for pattern in date_patterns:
-        matches = re.findall(pattern, message_lower)
-        for match in matches:
-            try:
-                parsed_date = dateparser.parse(match)
-                if parsed_date:
-                    extracted_dates.append(parsed_date.strftime('%Y-%m-%d'))
-            except:
-                continue
-    
-    # Extract times (more flexible patterns for natural language)
-    time_patterns = [
-        # Specific times with various formats
-        r'\d{1,2}:\d{2}\s*(am|pm)',
-        r'\d{1,2}\s*(am|pm)',
-        r'\d{1,2}:\d{2}',
-        r'\d{1,2}:\d{2}\s*(am|pm)',
-        
-        # Natural time expressions
-        r'at \d{1,2}',
-        r'around \d{1,2}',
-        r'about \d{1,2}',
-        r'\d{1,2}ish',
-        r'\d{1,2} o\'clock',
-        r'\d{1,2} o clock',
-        r'\d{1,2} pm',
-        r'\d{1,2} am',
-        r'\d{1,2} PM',
-        r'\d{1,2} AM',
-        
-        # Time periods
-        r'morning',
-        r'afternoon',
-        r'evening',
-        r'night',
-        r'noon',
-        r'midnight',
-        r'early morning',
-        r'late afternoon',
-        r'late evening',
-        
-        # Business hours
-        r'business hours',
-        r'office hours',
-        r'work hours',
-        r'9 to 5',
-        r'9-5',
-        
-        # Common natural expressions
-        r'this afternoon',
-        r'this morning',
-        r'this evening',
-        r'tomorrow morning',
-        r'tomorrow afternoon',
-        r'tomorrow evening',
-        r'next morning',
-        r'next afternoon',
-        r'next evening'
-    ]
+    today_date = date.fromisoformat(today)
+    for match in _find_patterns(_DATE_PATTERNS, _DATE_KEYWORDS, message_lower):
+        try:
+            parsed_date = _parse_iso_or_relative(match, today_date)
+            if parsed_date:
+                extracted_dates.append(parsed_date.strftime('%Y-%m-%d'))
+        except:
+            continue
     
     extracted_times = []
-    for pattern in time_patterns:
-        matches = re.findall(pattern, message_lower)
-        for match in matches:
-            if isinstance(match, tuple):
-                match = ''.join(match)
-            
-            # Convert natural language to specific times
-            if match in ['morning', 'this morning', 'tomorrow morning', 'next morning']:
-                extracted_times.append("9:00 AM")
-            elif match in ['afternoon', 'this afternoon', 'tomorrow afternoon', 'next afternoon']:
-                extracted_times.append("2:00 PM")
-            elif match in ['evening', 'this evening', 'tomorrow evening', 'next evening']:
-                extracted_times.append("6:00 PM")
-            elif match in ['night', 'late evening']:
-                extracted_times.append("8:00 PM")
-            elif match == 'noon':
-                extracted_times.append("12:00 PM")
-            elif match == 'midnight':
-                extracted_times.append("12:00 AM")
-            elif match in ['business hours', 'office hours', 'work hours', '9 to 5', '9-5']:
-                extracted_times.append("10:00 AM")
-            else:
-                # Handle specific time formats
-                if 'am' in match.lower() or 'pm' in match.lower():
-                    # Extract hour and format properly
-                    hour_match = re.search(r'(\d{1,2})', match)
-                    if hour_match:
-                        hour = int(hour_match.group(1))
-                        if 'pm' in match.lower() and hour != 12:
-                            hour += 12
-                        elif 'am' in match.lower() and hour == 12:
-                            hour = 0
-                        
-                        # Format as 12-hour time
-                        if hour == 0:
-                            formatted_time = "12:00 AM"
-                        elif hour < 12:
-                            formatted_time = f"{hour}:00 AM"
-                        elif hour == 12:
-                            formatted_time = "12:00 PM"
-                        else:
-                            formatted_time = f"{hour-12}:00 PM"
-                        
-                        extracted_times.append(formatted_time)
-                else:
-                    # Handle times without AM/PM - use business context
-                    hour_match = re.search(r'(\d{1,2})', match)
-                    if hour_match:
-                        hour = int(hour_match.group(1))
-                        
-                        # Business context: Most meetings are during business hours
-                        # 5-12 without AM/PM is typically PM (afternoon/evening)
-                        # 1-4 without AM/PM is typically PM (afternoon)
-                        # 6-11 without AM/PM is typically AM (morning)
-                        if hour >= 5 and hour <= 12:
-                            formatted_time = f"{hour}:00 PM"
-                        elif hour >= 1 and hour <= 4:
-                            formatted_time = f"{hour}:00 PM"
-                        elif hour >= 6 and hour <= 11:
-                            formatted_time = f"{hour}:00 AM"
-                        elif hour == 12:
-                            formatted_time = "12:00 PM"
-                        else:
-                            # Default to PM for business hours
-                            formatted_time = f"{hour}:00 PM"
-                        
-                        extracted_times.append(formatted_time)
-                    else:
-                        extracted_times.append(match)
-    
-    # Extract participants (more flexible name extraction)
-    name_patterns = [
-        # Direct mentions
-        r'with\s+([a-zA-Z]+)',
-        r'meet\s+([a-zA-Z]+)',
-        r'([a-zA-Z]+)\s+and\s+([a-zA-Z]+)',
-        r'([a-zA-Z]+),\s+([a-zA-Z]+)',
-        r'([a-zA-Z]+)\s*&\s*([a-zA-Z]+)',
+    for match in _find_patterns(_TIME_PATTERNS, _TIME_KEYWORDS, message_lower):
+        if isinstance(match, tuple):
+            match = ''.join(match)
         
-        # Team mentions
-        r'team',
-        r'everyone',
-        r'all',
-        r'group',
-        r'us',
-        r'we',
-        
-        # Role-based mentions
-        r'manager',
-        r'lead',
-        r'developer',
-        r'designer',
-        r'stakeholder',
-        r'client',
-        r'customer'
-    ]
+        # Convert natural language to specific times
+        if match in ['morning', 'this morning', 'tomorrow morning', 'next morning']:
+            extracted_times.append("9:00 AM")
+        elif match in ['afternoon', 'this afternoon', 'tomorrow afternoon', 'next afternoon']:
+            extracted_times.append("2:00 PM")
+        elif match in ['evening', 'this evening', 'tomorrow evening', 'next evening']:
+            extracted_times.append("6:00 PM")
+        elif match in ['night', 'late evening']:
+            extracted_times.append("8:00 PM")
+        elif match == 'noon':
+            extracted_times.append("12:00 PM")
+        elif match == 'midnight':
+            extracted_times.append("12:00 AM")
+        elif match in ['business hours', 'office hours', 'work hours', '9 to 5', '9-5']:
+            extracted_times.append("10:00 AM")
+        else:
+            # Handle specific time formats
+            meridiem = 'pm' if 'pm' in match else 'am' if 'am' in match else None
+            hour_match = _HOUR_PATTERN.search(match)
+            if hour_match:
+                extracted_times.append(_HOUR_LABELS[int(hour_match.group(1)), meridiem])
+            elif meridiem is None:
+                extracted_times.append(match)
     
-    participants = []
+    participants = set()
     
-    # Extract names from regex patterns
-    for pattern in name_patterns:
-        matches = re.findall(pattern, message_lower)
+    # Extract names from regex patterns; matches come from the lowercased text,
+    # so common words are filtered before capitalizing and duplicates collapse in the set
+    for pattern in _NAME_PATTERNS:
+        matches = pattern.findall(message_lower)
         for match in matches:
-            if isinstance(match, tuple):
-                participants.extend([name.capitalize() for name in match])
-            else:
-                participants.append(match.capitalize())
+            names = match if isinstance(match, tuple) else (match,)
+            participants.update(name.capitalize() for name in names if name not in _COMMON_WORDS)
     
     # Extract participants from chat history (emails)
     # This will be handled by the extract_meeting_details function in app.py
-    
-    # Remove duplicates and filter out common words
-    common_words = ['team', 'everyone', 'all', 'group', 'us', 'we', 'manager', 'lead', 'developer', 'designer', 'stakeholder', 'client', 'customer']
-    participants = [p for p in participants if p.lower() not in common_words]
-    participants = list(set(participants))
+    participants = list(participants)
     
     # Determine missing information
     missing_info = []
@@ -290,46 +427,7 @@ def analyze_meeting_intent(message: str) -> MeetingIntent:
     # If no time extracted, try to extract from common patterns
     if not suggested_time:
         # Look for time patterns in the original message
-        time_keywords = ['am', 'pm', 'morning', 'afternoon', 'evening', 'noon', 'midnight', 'at', 'around', 'about']
-        for keyword in time_keywords:
-            if keyword in message_lower:
-                if keyword == 'am' or keyword == 'pm':
-                    # Look for hour before am/pm
-                    hour_match = re.search(r'(\d{1,2})\s*(am|pm)', message_lower)
-                    if hour_match:
-                        hour = hour_match.group(1)
-                        ampm = hour_match.group(2)
-                        suggested_time = f"{hour}:00 {ampm.upper()}"
-                        break
-                elif keyword == 'at':
-                    # Look for "at 2" or "at 2pm" patterns
-                    at_match = re.search(r'at\s+(\d{1,2})(?:\s*(am|pm))?', message_lower)
-                    if at_match:
-                        hour = at_match.group(1)
-                        ampm = at_match.group(2) if at_match.group(2) else 'pm'
-                        suggested_time = f"{hour}:00 {ampm.upper()}"
-                        break
-                elif keyword in ['morning', 'afternoon', 'evening']:
-                    if keyword == 'morning':
-                        suggested_time = "9:00 AM"
-                    elif keyword == 'afternoon':
-                        suggested_time = "2:00 PM"
-                    elif keyword == 'evening':
-                        suggested_time = "6:00 PM"
-                    break
-                elif keyword == 'noon':
-                    suggested_time = "12:00 PM"
-                    break
-                elif keyword == 'midnight':
-                    suggested_time = "12:00 AM"
-                    break
-                elif keyword in ['around', 'about']:
-                    # Look for "around 2" or "about 3" patterns
-                    around_match = re.search(r'(around|about)\s+(\d{1,2})', message_lower)
-                    if around_match:
-                        hour = around_match.group(2)
-                        suggested_time = f"{hour}:00 PM"
-                        break
+        suggested_time = _fallback_time(message_lower)
     
     return MeetingIntent(
         intent_detected=True,
@@ -342,26 +440,36 @@ def analyze_meeting_intent(message: str) -> MeetingIntent:
         missing_info=missing_info
     )
 
+# Slots offered by suggest_meeting_times: common business hours on the next 3 days,
+# as offsets from midnight with their display labels
+_SUGGESTED_DAY_OFFSETS = (1, 2, 3)
+_SUGGESTED_HOURS = tuple(
+    (timedelta(hours=hour), datetime(2000, 1, 1, hour).strftime('%I:%M %p'))
+    for hour in (9, 10, 11, 14, 15, 16)
+)
+_MAX_SUGGESTIONS = 6
+
 def suggest_meeting_times(participants: List[str], duration_minutes: int = 60) -> List[Dict[str, Any]]:
     """
     Suggest meeting times based on common availability
     """
     # Simple suggestion logic - in a real app, this would check calendars
-    base_time = datetime.now()
+    midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
     suggestions = []
     
-    # Suggest times for the next 3 days
-    for day_offset in range(1, 4):
-        for hour in [9, 10, 11, 14, 15, 16]:  # Common business hours
-            suggested_time = base_time + timedelta(days=day_offset)
-            suggested_time = suggested_time.replace(hour=hour, minute=0, second=0, microsecond=0)
-            
+    for day_offset in _SUGGESTED_DAY_OFFSETS:
+        day = midnight + timedelta(days=day_offset)
+        day_label = day.strftime('%Y-%m-%d')
+        for hour_offset, time_label in _SUGGESTED_HOURS:
+            # Only the first few slots are returned, so stop building once there are enough
+            if len(suggestions) == _MAX_SUGGESTIONS:
+                return suggestions
             suggestions.append({
-                "datetime": suggested_time.isoformat(),
-                "date": suggested_time.strftime('%Y-%m-%d'),
-                "time": suggested_time.strftime('%I:%M %p'),
+                "datetime": (day + hour_offset).isoformat(),
+                "date": day_label,
+                "time": time_label,
                 "duration_minutes": duration_minutes,
                 "participants": participants
             })
     
-    return suggestions[:6]  # Return top 6 suggestions 
\ No newline at end of file
+    return suggestions 
\ No newline at end of file
@@ -1,339 +1,605 @@
 import sqlite3
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 import os
+import logging
+import queue
 import threading
+import time
+from contextlib import contextmanager
+import orjson
 from models import User, Message, Meeting, MeetingIntent
 
+logger = logging.getLogger(__name__)
+
+# Applied to every connection as it is opened: WAL lets readers run alongside
+# the writer, NORMAL sync avoids an fsync on every commit, and memory-mapped
+# reads share the OS page cache across the pooled connections
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Seconds a reader waits for a pooled connection once every one is in use
+READ_POOL_TIMEOUT = 30.0
+
+# Columns returned for each row type, listed so results don't depend on the table layout
+USER_COLUMNS = "id, name, email, created_at"
+MESSAGE_COLUMNS = "id, name, email, message, timestamp"
+MEETING_COLUMNS = "id, title, date, time, description, status, created_at"
+
+# Meetings table definition, shared by table creation and the participants migration
+MEETINGS_TABLE_COLUMNS = '''
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT,
+    date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    description TEXT,
+    status TEXT DEFAULT 'scheduled',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+'''
+
+# Latest N messages, returned oldest first by SQLite
+LATEST_MESSAGES_QUERY = f'''
+    SELECT * FROM (
+        SELECT {MESSAGE_COLUMNS} FROM messages ORDER BY timestamp DESC, id DESC LIMIT ?
+    ) ORDER BY timestamp ASC, id ASC
+'''
+
+# Chat statistics in one round trip
+STATISTICS_QUERY = '''
+    SELECT
+        (SELECT COUNT(*) FROM messages),
+        (SELECT COUNT(*) FROM users),
+        (SELECT COUNT(*) FROM meetings),
+        (SELECT COUNT(DISTINCT email) FROM messages),
+        (SELECT MAX(timestamp) FROM messages)
+'''
+
+# Meetings with their participants joined in list order; the unit separator
+# can't appear in an email or name, so splitting on it is unambiguous
+PARTICIPANTS_SEPARATOR = "\x1f"
+MEETINGS_QUERY = '''
+    SELECT m.id, m.title, m.date, m.time, m.description, m.status, m.created_at,
+           (SELECT group_concat(p.email, char(31)) FROM meeting_participants p
+            WHERE p.meeting_id = m.id) AS participants
+    FROM meetings m
+'''
+
+def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+    """Plain dict copy of a row, with the id as a string like the other backends"""
+    data = dict(row)
+    data["id"] = str(data["id"])
+    return data
+
+def _meeting_row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+    """Build a meeting dict from a MEETINGS_QUERY row"""
+    data = _row_to_dict(row)
+    participants = data["participants"]
+    data["participants"] = participants.split(PARTICIPANTS_SEPARATOR) if participants is not None else []
+    return data
+
 class SQLiteDatabaseManager:
     """SQLite database manager for the meeting scheduler application"""
     
-    def __init__(self, db_path: str = "meeting_scheduler.db"):
+    def __init__(self, db_path: str = "meeting_scheduler.db", read_pool_size: Optional[int] = None):
         self.db_path = db_path
-        self._local = threading.local()
+        
+        # Writes are serialized on one connection; reads borrow from a pool
+        self._write_lock = threading.Lock()
+        self._write_connection = self._connect()
+        self._read_pool = queue.Queue()
+        self._read_pool_size = read_pool_size or os.cpu_count() or 4
+        self._read_connections_opened = 0
+        self._read_pool_lock = threading.Lock()
+        
         self._create_tables()
-        print("✅ SQLite database initialized successfully")
+        logger.info("✅ SQLite database initialized successfully")
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open an autocommit connection with the performance pragmas applied"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30.0, isolation_level=None)
+        # Rows support access by column name and convert to dicts in C
+        conn.row_factory = sqlite3.Row
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    @contextmanager
+    def read_conn(self):
+        """Borrow a connection from the read pool, opening one while the pool is not full"""
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            with self._read_pool_lock:
+                can_open = self._read_connections_opened < self._read_pool_size
+                if can_open:
+                    self._read_connections_opened += 1
+            if can_open:
+                try:
+                    conn = self._connect()
+                except BaseException:
+                    # Give the slot back so a failed open doesn't shrink the pool
+                    with self._read_pool_lock:
+                        self._read_connections_opened -= 1
+                    raise
+            else:
+                try:
+                    conn = self._read_pool.get(timeout=READ_POOL_TIMEOUT)
+                except queue.Empty:
+                    raise sqlite3.OperationalError("Timed out waiting for a read connection") from None
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
     
-    def _get_connection(self):
-        """Get thread-local database connection"""
-        if not hasattr(self._local, 'connection'):
-            self._local.connection = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30.0)
-        return self._local.connection
+    @contextmanager
+    def write_conn(self):
+        """Run a BEGIN IMMEDIATE transaction on the shared write connection"""
+        with self._write_lock:
+            conn = self._write_connection
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            try:
+                conn.execute("COMMIT")
+            except BaseException:
+                # Leave the shared connection outside a transaction for the next writer
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
     
     def _create_tables(self):
         """Create database tables if they don't exist"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            
-            # Users table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    email TEXT UNIQUE NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Messages table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS messages (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    email TEXT NOT NULL,
-                    message TEXT NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Meetings table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS meetings (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT,
-                    date TEXT NOT NULL,
-                    time TEXT NOT NULL,
-                    participants TEXT NOT NULL,  -- JSON string
-                    description TEXT,
-                    status TEXT DEFAULT 'scheduled',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create indexes
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_messages_timestamp ON messages(timestamp)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_messages_email ON messages(email)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_meetings_date ON meetings(date)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_meetings_status ON meetings(status)')
-            
-            conn.commit()
-            print("✅ Database tables and indexes created successfully")
+            with self.write_conn() as conn:
+                cursor = conn.cursor()
+                
+                # Users table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS users (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        name TEXT NOT NULL,
+                        email TEXT UNIQUE NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                
+                # Messages table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS messages (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        name TEXT NOT NULL,
+                        email TEXT NOT NULL,
+                        message TEXT NOT NULL,
+                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                
+                # Meetings table
+                cursor.execute(f"CREATE TABLE IF NOT EXISTS meetings ({MEETINGS_TABLE_COLUMNS})")
+                
+                # Meeting participants, one row per attendee in list order; the
+                # primary key keeps each meeting's rows together and ordered
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS meeting_participants (
+                        meeting_id INTEGER NOT NULL,
+                        position INTEGER NOT NULL,
+                        email TEXT NOT NULL,
+                        PRIMARY KEY (meeting_id, position)
+                    ) WITHOUT ROWID
+                ''')
+                
+                # Older databases kept participants as a JSON list in meetings; move them over
+                meeting_columns = [column[1] for column in cursor.execute("PRAGMA table_info(meetings)")]
+                if "participants" in meeting_columns:
+                    cursor.execute('''
+                        INSERT OR IGNORE INTO meeting_participants (meeting_id, position, email)
+                        SELECT m.id, j.key, j.value FROM meetings m, json_each(m.participants) j
+                    ''')
+                    # Rebuild the table without the column rather than DROP COLUMN,
+                    # which needs SQLite 3.35; the id sequence carries over so ids
+                    # of deleted meetings are still not reused
+                    sequence = cursor.execute(
+                        "SELECT seq FROM sqlite_sequence WHERE name = 'meetings'"
+                    ).fetchone()
+                    cursor.execute(f"CREATE TABLE meetings_new ({MEETINGS_TABLE_COLUMNS})")
+                    cursor.execute(f'''
+                        INSERT INTO meetings_new ({MEETING_COLUMNS})
+                        SELECT {MEETING_COLUMNS} FROM meetings
+                    ''')
+                    cursor.execute("DROP TABLE meetings")
+                    cursor.execute("ALTER TABLE meetings_new RENAME TO meetings")
+                    if sequence:
+                        cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'meetings'", (sequence[0],))
+                    logger.info("✅ Moved meeting participants to their own table")
+                
+                # Created after the migration, which drops triggers along with the old table
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS trg_meetings_delete_participants AFTER DELETE ON meetings
+                    BEGIN
+                        DELETE FROM meeting_participants WHERE meeting_id = OLD.id;
+                    END
+                ''')
+                
+                # Create indexes
+                # (timestamp, email) serves time-ordered scans; it supersedes the
+                # single-column timestamp index
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_messages_ts_email ON messages(timestamp, email)')
+                cursor.execute('DROP INDEX IF EXISTS idx_messages_timestamp')
+                # (email, timestamp) returns per-user history already ordered, ties by id;
+                # it supersedes the single-column email index and the earlier DESC variant
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_messages_email_timestamp ON messages(email, timestamp)')
+                cursor.execute('DROP INDEX IF EXISTS idx_messages_email')
+                cursor.execute('DROP INDEX IF EXISTS idx_messages_email_ts')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_meetings_date ON meetings(date)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_meetings_status ON meetings(status)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_meeting_participants_email ON meeting_participants(email)')
+                
+                # Messages version counter, bumped by triggers whenever messages change
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS messages_version (
+                        id INTEGER PRIMARY KEY CHECK (id = 1),
+                        version INTEGER NOT NULL
+                    )
+                ''')
+                cursor.execute('INSERT OR IGNORE INTO messages_version (id, version) VALUES (1, 0)')
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS trg_messages_insert_version AFTER INSERT ON messages
+                    BEGIN
+                        UPDATE messages_version SET version = version + 1 WHERE id = 1;
+                    END
+                ''')
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS trg_messages_delete_version AFTER DELETE ON messages
+                    BEGIN
+                        UPDATE messages_version SET version = version + 1 WHERE id = 1;
+                    END
+                ''')
+                
+                # Meeting contexts computed for a given messages version
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS meeting_context_cache (
+                        id INTEGER PRIMARY KEY CHECK (id = 1),
+                        version INTEGER NOT NULL,
+                        contexts_json TEXT NOT NULL,
+                        built_at REAL NOT NULL
+                    )
+                ''')
             
+            logger.info("✅ Database tables and indexes created successfully")
+        
         except Exception as e:
-            print(f"❌ Error creating tables: {e}")
+            logger.error("❌ Error creating tables: %s", e)
             raise e
     
     def test_connection(self) -> bool:
         """Test database connection"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1")
+            with self.read_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1")
             return True
         except Exception as e:
-            print(f"❌ Database connection failed: {e}")
+            logger.error("❌ Database connection failed: %s", e)
             return False
     
     # User operations
     def create_user(self, name: str, email: str) -> Optional[str]:
         """Create a new user"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT INTO users (name, email) VALUES (?, ?)",
-                (name, email)
-            )
-            conn.commit()
+            with self.write_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "INSERT INTO users (name, email) VALUES (?, ?)",
+                    (name, email)
+                )
             return str(cursor.lastrowid)
         except sqlite3.IntegrityError:
-            print(f"⚠️ User with email {email} already exists")
+            logger.warning("⚠️ User with email %s already exists", email)
             return None
         except Exception as e:
-            print(f"❌ Error creating user: {e}")
+            logger.error("❌ Error creating user: %s", e)
             return None
     
+    def create_users_bulk(self, users: List[Dict[str, Any]]) -> List[str]:
+        """Create several users in one transaction, skipping emails that already exist"""
+        if not users:
+            return []
+        try:
+            user_ids = []
+            with self.write_conn() as conn:
+                cursor = conn.cursor()
+                for user in users:
+                    cursor.execute(
+                        "INSERT OR IGNORE INTO users (name, email) VALUES (?, ?)",
+                        (user["name"], user["email"])
+                    )
+                    if cursor.rowcount:
+                        user_ids.append(str(cursor.lastrowid))
+            return user_ids
+        except Exception as e:
+            logger.error("❌ Error creating users: %s", e)
+            return []
+    
     def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """Get user by email"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM users WHERE email = ?", (email,))
-            row = cursor.fetchone()
-            if row:
-                return {
-                    "id": str(row[0]),
-                    "name": row[1],
-                    "email": row[2],
-                    "created_at": row[3]
-                }
-            return None
+            with self.read_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"SELECT {USER_COLUMNS} FROM users WHERE email = ?", (email,))
+                row = cursor.fetchone()
+            return _row_to_dict(row) if row else None
         except Exception as e:
-            print(f"❌ Error getting user: {e}")
+            logger.error("❌ Error getting user: %s", e)
             return None
     
     def get_all_users(self) -> List[Dict[str, Any]]:
         """Get all users"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM users ORDER BY created_at DESC")
-            rows = cursor.fetchall()
-            return [
-                {
-                    "id": str(row[0]),
-                    "name": row[1],
-                    "email": row[2],
-                    "created_at": row[3]
-                }
-                for row in rows
-            ]
+            with self.read_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"SELECT {USER_COLUMNS} FROM users ORDER BY created_at DESC")
+                rows = cursor.fetchall()
+            return [_row_to_dict(row) for row in rows]
         except Exception as e:
-            print(f"❌ Error getting users: {e}")
+            logger.error("❌ Error getting users: %s", e)
             return []
     
     # Message operations
     def save_message(self, name: str, email: str, message: str) -> Optional[str]:
         """Save a new message and auto-create user if they don't exist"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            
-            # First, check if user exists
-            cursor.execute("SELECT id FROM users WHERE email = ?", (email,))
-            user_exists = cursor.fetchone()
-            
-            # If user doesn't exist, create them
-            if not user_exists:
+            with self.write_conn() as conn:
+                cursor = conn.cursor()
+                
+                # Create the user unless the email is already registered
                 cursor.execute(
-                    "INSERT INTO users (name, email) VALUES (?, ?)",
+                    "INSERT OR IGNORE INTO users (name, email) VALUES (?, ?)",
                     (name, email)
                 )
-                print(f"✅ Auto-created user: {name} ({email})")
-            
-            # Save the message
-            cursor.execute(
-                "INSERT INTO messages (name, email, message) VALUES (?, ?, ?)",
-                (name, email, message)
-            )
-            conn.commit()
+                if cursor.rowcount:
+                    logger.info("✅ Auto-created user: %s (%s)", name, email)
+                
+                # Save the message
+                cursor.execute(
+                    "INSERT INTO messages (name, email, message) VALUES (?, ?, ?)",
+                    (name, email, message)
+                )
             return str(cursor.lastrowid)
         except Exception as e:
-            print(f"❌ Error saving message: {e}")
+            logger.error("❌ Error saving message: %s", e)
             return None
     
+    def save_messages_bulk(self, messages: List[Dict[str, Any]],
+                           skip_user_check: bool = False) -> List[str]:
+        """Save several messages in one transaction, auto-creating missing users
+        unless the caller already registered every sender"""
+        if not messages:
+            return []
+        try:
+            with self.write_conn() as conn:
+                cursor = conn.cursor()
+                if not skip_user_check:
+                    cursor.executemany(
+                        "INSERT OR IGNORE INTO users (name, email) VALUES (?, ?)",
+                        [(msg["name"], msg["email"]) for msg in messages]
+                    )
+                    if cursor.rowcount > 0:
+                        logger.info("✅ Auto-created %s users", cursor.rowcount)
+                
+                cursor.executemany(
+                    "INSERT INTO messages (name, email, message) VALUES (?, ?, ?)",
+                    [(msg["name"], msg["email"], msg["message"]) for msg in messages]
+                )
+                # Rows inserted by one writer in one transaction get consecutive ids
+                last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+            first_id = last_id - len(messages) + 1
+            return [str(message_id) for message_id in range(first_id, last_id + 1)]
+        except Exception as e:
+            logger.error("❌ Error saving messages: %s", e)
+            return []
+    
     def get_messages(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get messages with limit"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM messages ORDER BY timestamp DESC LIMIT ?",
-                (limit,)
-            )
-            rows = cursor.fetchall()
-            # Reverse to show oldest first
-            return [
-                {
-                    "id": str(row[0]),
-                    "name": row[1],
-                    "email": row[2],
-                    "message": row[3],
-                    "timestamp": row[4]
-                }
-                for row in reversed(rows)
-            ]
+            with self.read_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(LATEST_MESSAGES_QUERY, (limit,))
+                rows = cursor.fetchall()
+            return [_row_to_dict(row) for row in rows]
         except Exception as e:
-            print(f"❌ Error getting messages: {e}")
+            logger.error("❌ Error getting messages: %s", e)
             return []
     
+    def iter_messages(self, limit: int = 100) -> Iterator[Dict[str, Any]]:
+        """Yield messages one row at a time, holding a read connection until exhausted"""
+        started = False
+        try:
+            with self.read_conn() as conn:
+                for row in conn.execute(LATEST_MESSAGES_QUERY, (limit,)):
+                    started = True
+                    yield _row_to_dict(row)
+        except Exception as e:
+            # Once rows went out, a short stream must not pass for a complete one
+            if started:
+                raise
+            logger.error("❌ Error streaming messages: %s", e)
+    
     def get_messages_by_user(self, email: str) -> List[Dict[str, Any]]:
         """Get messages by user email"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM messages WHERE email = ? ORDER BY timestamp DESC",
-                (email,)
-            )
-            rows = cursor.fetchall()
-            return [
-                {
-                    "id": str(row[0]),
-                    "name": row[1],
-                    "email": row[2],
-                    "message": row[3],
-                    "timestamp": row[4]
-                }
-                for row in reversed(rows)
-            ]
+            with self.read_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f"SELECT {MESSAGE_COLUMNS} FROM messages WHERE email = ? ORDER BY timestamp ASC, id ASC",
+                    (email,)
+                )
+                rows = cursor.fetchall()
+            return [_row_to_dict(row) for row in rows]
         except Exception as e:
-            print(f"❌ Error getting user messages: {e}")
+            logger.error("❌ Error getting user messages: %s", e)
             return []
     
     # Meeting operations
-    def create_meeting(self, date: str, time: str, participants: List[str], 
+    def create_meeting(self, date: str, time: str, participants: List[str],
                       title: str = None, description: str = None) -> Optional[str]:
         """Create a new meeting"""
         try:
-            import json
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            
-            # Convert participants list to JSON string
-            participants_json = json.dumps(participants)
-            
-            cursor.execute(
-                "INSERT INTO meetings (title, date, time, participants, description) VALUES (?, ?, ?, ?, ?)",
-                (title or f"Meeting on {date}", date, time, participants_json, description)
-            )
-            conn.commit()
-            return str(cursor.lastrowid)
+            with self.write_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "INSERT INTO meetings (title, date, time, description) VALUES (?, ?, ?, ?)",
+                    (title or f"Meeting on {date}", date, time, description)
+                )
+                meeting_id = cursor.lastrowid
+                cursor.executemany(
+                    "INSERT INTO meeting_participants (meeting_id, position, email) VALUES (?, ?, ?)",
+                    [(meeting_id, position, email) for position, email in enumerate(participants)]
+                )
+            return str(meeting_id)
         except Exception as e:
-            print(f"❌ Error creating meeting: {e}")
+            logger.error("❌ Error creating meeting: %s", e)
             return None
     
+    def create_meetings(self, meetings: List[Dict[str, Any]]) -> List[str]:
+        """Create several meetings in a single transaction"""
+        if not meetings:
+            return []
+        try:
+            rows = [
+                (
+                    meeting.get("title") or f"Meeting on {meeting['date']}",
+                    meeting["date"],
+                    meeting["time"],
+                    meeting.get("description")
+                )
+                for meeting in meetings
+            ]
+            
+            with self.write_conn() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    "INSERT INTO meetings (title, date, time, description) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                # Rows inserted by one writer in one transaction get consecutive ids
+                last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+                first_id = last_id - len(rows) + 1
+                cursor.executemany(
+                    "INSERT INTO meeting_participants (meeting_id, position, email) VALUES (?, ?, ?)",
+                    [
+                        (meeting_id, position, email)
+                        for meeting_id, meeting in enumerate(meetings, start=first_id)
+                        for position, email in enumerate(meeting["participants"])
+                    ]
+                )
+            return [str(meeting_id) for meeting_id in range(first_id, last_id + 1)]
+        except Exception as e:
+            logger.error("❌ Error creating meetings: %s", e)
+            return []
+    
     def get_meetings(self) -> List[Dict[str, Any]]:
         """Get all meetings"""
         try:
-            import json
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM meetings ORDER BY created_at DESC")
-            rows = cursor.fetchall()
-            return [
-                {
-                    "id": str(row[0]),
-                    "title": row[1],
-                    "date": row[2],
-                    "time": row[3],
-                    "participants": json.loads(row[4]),
-                    "description": row[5],
-                    "status": row[6],
-                    "created_at": row[7]
-                }
-                for row in rows
-            ]
+            with self.read_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(MEETINGS_QUERY + " ORDER BY m.created_at DESC")
+                rows = cursor.fetchall()
+            return [_meeting_row_to_dict(row) for row in rows]
         except Exception as e:
-            print(f"❌ Error getting meetings: {e}")
+            logger.error("❌ Error getting meetings: %s", e)
             return []
     
     def get_meeting_by_id(self, meeting_id: str) -> Optional[Dict[str, Any]]:
         """Get meeting by ID"""
         try:
-            import json
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM meetings WHERE id = ?", (meeting_id,))
-            row = cursor.fetchone()
+            with self.read_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(MEETINGS_QUERY + " WHERE m.id = ?", (meeting_id,))
+                row = cursor.fetchone()
+            return _meeting_row_to_dict(row) if row else None
+        except Exception as e:
+            logger.error("❌ Error getting meeting: %s", e)
+            return None
+    
+    def update_meeting_status(self, meeting_id: str, status: str) -> bool:
+        """Update meeting status"""
+        try:
+            with self.write_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "UPDATE meetings SET status = ? WHERE id = ?",
+                    (status, meeting_id)
+                )
+            return cursor.rowcount > 0
+        except Exception as e:
+            logger.error("❌ Error updating meeting status: %s", e)
+            return False
+    
+    # Meeting context cache
+    def get_messages_version(self) -> int:
+        """Get the counter that changes whenever messages are added or removed"""
+        try:
+            with self.read_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT version FROM messages_version WHERE id = 1")
+                row = cursor.fetchone()
+            return row[0] if row else 0
+        except Exception as e:
+            logger.error("❌ Error getting messages version: %s", e)
+            return -1
+    
+    def get_cached_meeting_contexts(self) -> Optional[Dict[str, Any]]:
+        """Get the cached meeting contexts with the messages version they were built from"""
+        try:
+            with self.read_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT version, contexts_json, built_at FROM meeting_context_cache WHERE id = 1")
+                row = cursor.fetchone()
             if row:
                 return {
-                    "id": str(row[0]),
-                    "title": row[1],
-                    "date": row[2],
-                    "time": row[3],
-                    "participants": json.loads(row[4]),
-                    "description": row[5],
-                    "status": row[6],
-                    "created_at": row[7]
+                    "version": row["version"],
+                    "contexts": orjson.loads(row["contexts_json"]),
+                    "built_at": row["built_at"]
                 }
             return None
         except Exception as e:
-            print(f"❌ Error getting meeting: {e}")
+            logger.error("❌ Error getting cached meeting contexts: %s", e)
             return None
     
-    def update_meeting_status(self, meeting_id: str, status: str) -> bool:
-        """Update meeting status"""
+    def save_meeting_contexts(self, version: int, contexts: List[Dict[str, Any]]) -> bool:
+        """Store meeting contexts computed for the given messages version"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE meetings SET status = ? WHERE id = ?",
-                (status, meeting_id)
-            )
-            conn.commit()
-            return cursor.rowcount > 0
+            # Stored as the raw UTF-8 bytes; orjson.loads reads them back without a decode
+            contexts_json = orjson.dumps(contexts, default=str)
+            with self.write_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "INSERT OR REPLACE INTO meeting_context_cache (id, version, contexts_json, built_at) VALUES (1, ?, ?, ?)",
+                    (version, contexts_json, time.time())
+                )
+            return True
         except Exception as e:
-            print(f"❌ Error updating meeting status: {e}")
+            logger.error("❌ Error caching meeting contexts: %s", e)
             return False
     
     def get_chat_statistics(self) -> Dict[str, Any]:
         """Get chat statistics"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            
-            # Get total messages
-            cursor.execute("SELECT COUNT(*) FROM messages")
-            total_messages = cursor.fetchone()[0]
-            
-            # Get total users
-            cursor.execute("SELECT COUNT(*) FROM users")
-            total_users = cursor.fetchone()[0]
-            
-            # Get total meetings
-            cursor.execute("SELECT COUNT(*) FROM meetings")
-            total_meetings = cursor.fetchone()[0]
-            
-            # Get unique participants
-            cursor.execute("SELECT COUNT(DISTINCT email) FROM messages")
-            unique_participants = cursor.fetchone()[0]
-            
-            # Get last message timestamp
-            cursor.execute("SELECT timestamp FROM messages ORDER BY timestamp DESC LIMIT 1")
-            last_message = cursor.fetchone()
-            last_message_time = last_message[0] if last_message else None
+            with self.read_conn() as conn:
+                cursor = conn.cursor()
+                # All counters in one statement; MAX(timestamp) is NULL when there are no messages
+                cursor.execute(STATISTICS_QUERY)
+                (total_messages, total_users, total_meetings,
+                 unique_participants, last_message_time) = cursor.fetchone()
             
             return {
                 "total_messages": total_messages,
@@ -343,7 +609,7 @@ class SQLiteDatabaseManager:
                 "last_message": last_message_time
             }
         except Exception as e:
-            print(f"❌ Error getting statistics: {e}")
+            logger.error("❌ Error getting statistics: %s", e)
             return {
                 "total_messages": 0,
                 "total_users": 0,
@@ -353,15 +619,30 @@ class SQLiteDatabaseManager:
             }
     
     def close_connection(self):
-        """Close database connection"""
+        """Close database connections"""
         try:
-            if hasattr(self._local, 'connection'):
-                self._local.connection.close()
-                delattr(self._local, 'connection')
-            print("✅ Database connection closed")
+            with self._write_lock:
+                self._write_connection.close()
+            while True:
+                try:
+                    self._read_pool.get_nowait().close()
+                except queue.Empty:
+                    break
+            logger.info("✅ Database connection closed")
         except Exception as e:
-            print(f"❌ Error closing connection: {e}")
+            logger.error("❌ Error closing connection: %s", e)
+
+# Global SQLite database manager instance, shared so there is one writer per process
+sqlite_db_manager = None
+_sqlite_db_lock = threading.Lock()
 
 def get_sqlite_db_manager() -> SQLiteDatabaseManager:
     """Get SQLite database manager instance"""
-    return SQLiteDatabaseManager() 
\ No newline at end of file
+    global sqlite_db_manager
+    if sqlite_db_manager is None:
+        with _sqlite_db_lock:
+            if sqlite_db_manager is None:
+                # Size the read pool to the server's thread count (e.g. gunicorn --threads)
+                read_pool_size = int(os.getenv("SQLITE_READ_POOL_SIZE", "0")) or None
+                sqlite_db_manager = SQLiteDatabaseManager(read_pool_size=read_pool_size)
+    return sqlite_db_manager
\ No newline at end of file
@@ -1,85 +1,191 @@
 import os
+import re
+import sys
+import logging
+import logging.handlers
+import random
+import time
+import functools
+import atexit
+from contextlib import closing
 from dotenv import load_dotenv
-from pymongo import MongoClient
-from pymongo.errors import ServerSelectionTimeoutError
+from pymongo import MongoClient, uri_parser
+from pymongo.errors import ServerSelectionTimeoutError, AutoReconnect, ConfigurationError
 
-# Load environment variables
-load_dotenv()
+# Load environment variables, unless they are already set (e.g. in a container)
+if not os.environ.get("MONGO_URI"):
+    load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+def _is_tls_error(error):
+    """Whether a connection failure comes from the TLS handshake"""
+    # A bad URI or option is not a TLS problem; other TLS options won't fix it
+    if isinstance(error, ConfigurationError):
+        return False
+    message = str(error)
+    return "SSL" in message or "TLS" in message or "certificate" in message
+
+def _retry(fn, max_attempts=3, base=1.0, cap=30.0, jitter=0.5):
+    """Call fn, retrying transient network errors with exponential backoff and jitter;
+    anything else (e.g. an authentication OperationFailure or a TLS failure) is raised at once"""
+    for attempt in range(max_attempts):
+        try:
+            return fn()
+        except (ServerSelectionTimeoutError, AutoReconnect) as e:
+            if attempt == max_attempts - 1 or _is_tls_error(e):
+                raise
+            time.sleep(min(cap, base * 2 ** attempt) * (1 + random.random() * jitter))
+
+SRV_SCHEME = "mongodb+srv://"
+
+# Pool settings for every probe client: a ping needs one socket, and the
+# long heartbeat keeps monitoring from opening connections of its own
+PROBE_OPTIONS = dict(
+    maxPoolSize=1,
+    minPoolSize=0,
+    heartbeatFrequencyMS=600000
+)
+
+# Read once at import; the non-SSL fallback is the same URI without SRV
+MONGO_URI = os.getenv("MONGO_URI")
+MONGO_URI_WITHOUT_SSL = (
+    "mongodb://" + MONGO_URI[len(SRV_SCHEME):]
+    if MONGO_URI and MONGO_URI.startswith(SRV_SCHEME) else MONGO_URI
+)
+
+# Connection attempts in order: (label, uri, client options). None means the shared
+# client; the others are only built after the previous attempt failed during TLS setup
+CONNECTION_OPTIONS = (
+    ("Basic connection", MONGO_URI, None),
+    ("Relaxed TLS connection", MONGO_URI, dict(
+        serverSelectionTimeoutMS=2000,
+        # tlsInsecure implies invalid certificates and hostnames are allowed
+        tls=True,
+        tlsInsecure=True,
+        retryWrites=True,
+        w='majority'
+    )),
+    ("Non-SSL connection", MONGO_URI_WITHOUT_SSL, dict(serverSelectionTimeoutMS=2000))
+)
+
+@functools.lru_cache(maxsize=8)
+def _resolve_srv(uri):
+    """Expand a mongodb+srv:// URI into the equivalent mongodb:// seed list, so the
+    SRV and TXT lookups happen once instead of once per client"""
+    if not uri.startswith(SRV_SCHEME):
+        return uri
+    parsed = uri_parser.parse_uri(uri)
+    seeds = ",".join(f"{host}:{port}" for host, port in parsed["nodelist"])
+    
+    # Keep the credentials, database and other query options as written
+    rest = uri[len(SRV_SCHEME):]
+    authority_end = min((i for i in (rest.find('/'), rest.find('?')) if i != -1), default=len(rest))
+    userinfo, at, _ = rest[:authority_end].rpartition('@')
+    path, _, query = rest[authority_end:].lstrip('/').partition('?')
+    # srvServiceName and srvMaxHosts are already applied to the seed list, and
+    # mongodb:// URIs reject them
+    pairs = [pair for pair in re.split('[&;]', query) if pair and not pair.lower().startswith('srv')]
+    query = "&".join(pairs)
+    given = {pair.split('=')[0].lower() for pair in pairs}
+    
+    # Add what the SRV scheme implied: options from the TXT record, and TLS on by default
+    options = parsed["options"]
+    extra = [
+        f"{name}={str(options[name]).lower() if isinstance(options[name], bool) else options[name]}"
+        for name in ("authSource", "replicaSet", "loadBalanced")
+        if name in options and name.lower() not in given
+    ]
+    if not given & {"tls", "ssl"}:
+        extra.append("tls=true")
+    query = "&".join(filter(None, [query] + extra))
+    return f"mongodb://{userinfo}{at}{seeds}/{path}" + (f"?{query}" if query else "")
+
+def _ping(uri, **options):
+    """Connect with the given options and ping the server"""
+    # Closed on the way out even when the ping fails, releasing its socket and monitor threads
+    with closing(MongoClient(_resolve_srv(uri), **options, **PROBE_OPTIONS)) as client:
+        _retry(lambda: client.admin.command('ping'))
+
+# Client for the standard options, shared across test runs so a repeated check
+# (e.g. a health check) only costs a ping once the first one has connected
+_client = None
+
+def _get_client(uri):
+    """Get the shared client, created on first use"""
+    global _client
+    if _client is None:
+        # connect=False defers the handshake to the first ping
+        _client = MongoClient(
+            _resolve_srv(uri),
+            serverSelectionTimeoutMS=2000,
+            retryWrites=True,
+            w='majority',
+            connect=False,
+            **PROBE_OPTIONS
+        )
+    return _client
+
+def _close_client():
+    """Close the shared client at interpreter exit"""
+    if _client is not None:
+        _client.close()
+
+atexit.register(_close_client)
 
 def test_mongo_connection():
     """Test MongoDB connection with detailed error reporting"""
     
     # Get the MongoDB URI
-    mongo_uri = os.getenv("MONGO_URI")
-    print(f"Testing connection with URI: {mongo_uri[:50]}...")
-    
+    mongo_uri = MONGO_URI
     if not mongo_uri:
-        print("❌ MONGO_URI not found in environment variables")
+        logger.error("❌ MONGO_URI not found in environment variables")
         return False
+    logger.info("Testing connection with URI: %.50s...", mongo_uri)
     
     try:
-        # Test with different connection options
-        print("\n🔍 Testing connection options...")
+        logger.info("\n🔍 Testing connection options...")
         
-        # Option 1: Basic connection
-        print("1. Testing basic connection...")
-        client1 = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
-        client1.admin.command('ping')
-        print("✅ Basic connection successful!")
-        client1.close()
-        
-        # Option 2: With enhanced SSL settings
-        print("2. Testing with enhanced SSL settings...")
-        client2 = MongoClient(
-            mongo_uri,
-            serverSelectionTimeoutMS=20000,
-            connectTimeoutMS=20000,
-            socketTimeoutMS=20000,
-            ssl=True,
-            ssl_cert_reqs='CERT_NONE',
-            tlsAllowInvalidCertificates=True,
-            tlsAllowInvalidHostnames=True,
-            tlsInsecure=True,
-            directConnection=False,
-            retryWrites=True,
-            w='majority'
-        )
-        client2.admin.command('ping')
-        print("✅ Enhanced SSL connection successful!")
-        client2.close()
-        
-        # Option 3: Try without SSL (for testing)
-        print("3. Testing without SSL (fallback)...")
-        try:
-            # Remove SSL from URI temporarily
-            uri_without_ssl = mongo_uri.replace('mongodb+srv://', 'mongodb://')
-            client3 = MongoClient(uri_without_ssl, serverSelectionTimeoutMS=5000)
-            client3.admin.command('ping')
-            print("✅ Non-SSL connection successful!")
-            client3.close()
-        except Exception as e:
-            print(f"⚠️ Non-SSL connection also failed: {e}")
-        
-        return True
+        # Stop at the first attempt that works, so a healthy cluster costs one handshake
+        for number, (label, uri, options) in enumerate(CONNECTION_OPTIONS, start=1):
+            logger.info("%s. Testing %s...", number, label.lower())
+            try:
+                if options is None:
+                    client = _get_client(uri)
+                    _retry(lambda: client.admin.command('ping'))
+                else:
+                    _ping(uri, **options)
+            except Exception as e:
+                # Only a TLS failure is worth retrying with different options
+                if number == len(CONNECTION_OPTIONS) or not _is_tls_error(e):
+                    raise
+                logger.warning("⚠️ %s failed during TLS setup: %s", label, e)
+                continue
+            logger.info("✅ %s successful!", label)
+            return True
         
     except ServerSelectionTimeoutError as e:
-        print(f"❌ Server selection timeout: {e}")
-        print("\n🔧 Troubleshooting tips:")
-        print("1. Check if your IP is whitelisted in MongoDB Atlas")
-        print("2. Verify your database user exists and has correct permissions")
-        print("3. Check if your MongoDB Atlas cluster is active")
+        logger.error("❌ Server selection timeout: %s", e)
+        logger.error("\n🔧 Troubleshooting tips:\n"
+                     "1. Check if your IP is whitelisted in MongoDB Atlas\n"
+                     "2. Verify your database user exists and has correct permissions\n"
+                     "3. Check if your MongoDB Atlas cluster is active")
         return False
         
     except Exception as e:
-        print(f"❌ Connection error: {e}")
-        print(f"Error type: {type(e).__name__}")
+        logger.error("❌ Connection error: %s (%s)", e, type(e).__name__)
         return False
 
 if __name__ == "__main__":
+    # Buffer the report and write it in one go once the test is done
+    report = logging.handlers.MemoryHandler(capacity=1000, target=logging.StreamHandler(sys.stdout))
+    logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[report])
+    
     print("🧪 MongoDB Connection Test")
     print("=" * 40)
     
     success = test_mongo_connection()
+    report.flush()
     
     if success:
         print("\n🎉 MongoDB connection test passed!")